@@ -1,3 +1,4 @@
+from typing import Literal
 from pydantic import Field
 from pydantic_settings import (
     BaseSettings,
@@ -24,10 +25,34 @@ class Settings(BaseSettings):
         validation_alias='LOGGER_NAME',
         default='uvicorn'
     )
+    log_format: Literal['json', 'text'] = Field(
+        validation_alias='LOG_FORMAT',
+        default='json'
+    )
+    log_queue_loggers: list[str] = Field(
+        validation_alias='LOG_QUEUE_LOGGERS',
+        default=['uvicorn', 'uvicorn.access']
+    )
+    log_queue_size: int = Field(
+        validation_alias='LOG_QUEUE_SIZE',
+        default=10_000  # records are dropped instead of blocking once full
+    )
+    log_sample_rates: dict[str, float] = Field(
+        validation_alias='LOG_SAMPLE_RATES',
+        default={}  # JSON object of logger name to the share of info records kept
+    )
     request_id_ctx_key: str = Field(
         validation_alias='REQUEST_ID_CTX_KEY',
         default='request_id'
     )
+    request_id_header: str = Field(
+        validation_alias='REQUEST_ID_HEADER',
+        default='X-Request-ID'
+    )
+    trust_request_id_header: bool = Field(
+        validation_alias='TRUST_REQUEST_ID_HEADER',
+        default=True
+    )
     access_token_exp_delta: int = Field(
         validation_alias='ACCESS_TOKEN_EXP_DELTA',
         default=60*24  # in minutes
@@ -44,6 +69,239 @@ class Settings(BaseSettings):
         validation_alias='TOKEN_ISSUER',
         default='api:loongrid'
     )
+    hashing_workers: int = Field(
+        validation_alias='HASHING_WORKERS',
+        default=2
+    )
+    metrics_enabled: bool = Field(
+        validation_alias='METRICS_ENABLED',
+        default=True
+    )
+    health_probe_interval: float = Field(
+        validation_alias='HEALTH_PROBE_INTERVAL',
+        default=5.0  # in seconds
+    )
+    health_probe_timeout: float = Field(
+        validation_alias='HEALTH_PROBE_TIMEOUT',
+        default=2.0  # in seconds
+    )
+    warmup_enabled: bool = Field(
+        validation_alias='WARMUP_ENABLED',
+        default=True
+    )
+    warmup_timeout: float = Field(
+        validation_alias='WARMUP_TIMEOUT',
+        default=30.0  # in seconds
+    )
+    loop_monitor_enabled: bool = Field(
+        validation_alias='LOOP_MONITOR_ENABLED',
+        default=True
+    )
+    loop_monitor_interval: float = Field(
+        validation_alias='LOOP_MONITOR_INTERVAL',
+        default=0.1  # in seconds
+    )
+    loop_stall_threshold: float = Field(
+        validation_alias='LOOP_STALL_THRESHOLD',
+        default=0.1  # in seconds of lag before the loop stack is captured
+    )
+    loop_stall_max_sites: int = Field(
+        validation_alias='LOOP_STALL_MAX_SITES',
+        default=50
+    )
+    admission_enabled: bool = Field(
+        validation_alias='ADMISSION_ENABLED',
+        default=True
+    )
+    admission_max_in_flight: int = Field(
+        validation_alias='ADMISSION_MAX_IN_FLIGHT',
+        default=256  # admitted requests per worker
+    )
+    admission_pool_wait_budget: float = Field(
+        validation_alias='ADMISSION_POOL_WAIT_BUDGET',
+        default=1.0  # in seconds of expected wait for a database connection
+    )
+    admission_classes: dict[str, float] = Field(
+        validation_alias='ADMISSION_CLASSES',
+        default={
+            'critical': 1.0,
+            'normal': 0.8,
+            'low': 0.5
+        }  # JSON object of priority class to its share of the in-flight and pool wait limits
+    )
+    admission_routes: dict[str, str] = Field(
+        validation_alias='ADMISSION_ROUTES',
+        default={
+            '/health*': 'exempt',
+            '/metrics*': 'exempt',
+            '/oauth*': 'critical',
+            '/admin*': 'low',
+            'GET /users': 'low'
+        }  # JSON object of optional method and path below the API prefix, * for prefixes, to priority class
+    )
+    bulkheads: dict[str, dict] = Field(
+        validation_alias='BULKHEADS',
+        default={
+            'auth': {'tags': ['Authentication'], 'share': 0.4},
+            'users': {'tags': ['Users'], 'share': 0.4},
+            'admin': {'tags': ['Administration'], 'share': 0.15}
+        }  # JSON object of bulkhead to the router tags it covers, its share of the pool capacity or a fixed limit, and optionally max_wait
+    )
+    bulkhead_max_wait: float = Field(
+        validation_alias='BULKHEAD_MAX_WAIT',
+        default=0.5  # in seconds a request waits for a full bulkhead before it is rejected
+    )
+    rate_limit_enabled: bool = Field(
+        validation_alias='RATE_LIMIT_ENABLED',
+        default=True
+    )
+    rate_limit_backend: Literal['local', 'shared'] = Field(
+        validation_alias='RATE_LIMIT_BACKEND',
+        default='local'
+    )
+    rate_limit_rules: dict[str, dict] = Field(
+        validation_alias='RATE_LIMIT_RULES',
+        default={
+            'default': {'rate': 50, 'burst': 100},
+            'login': {'rate': 1, 'burst': 10},
+            'users_list': {'rate': 10, 'burst': 20, 'page_size': 50}
+        }  # JSON object of route group to rate per second, burst and optionally page_size
+    )
+    rate_limit_routes: dict[str, str] = Field(
+        validation_alias='RATE_LIMIT_ROUTES',
+        default={
+            'POST /oauth/token': 'login',
+            'GET /users': 'users_list'
+        }  # JSON object of method and path below the API prefix to route group
+    )
+    rate_limit_shared_slots: int = Field(
+        validation_alias='RATE_LIMIT_SHARED_SLOTS',
+        default=16384
+    )
+    rate_limit_cleanup_interval: float = Field(
+        validation_alias='RATE_LIMIT_CLEANUP_INTERVAL',
+        default=60.0  # in seconds
+    )
+    login_free_attempts: int = Field(
+        validation_alias='LOGIN_FREE_ATTEMPTS',
+        default=5  # failed logins per identifier before backing off
+    )
+    login_backoff_base: float = Field(
+        validation_alias='LOGIN_BACKOFF_BASE',
+        default=1.0  # in seconds, doubled on every further failure
+    )
+    login_backoff_max: float = Field(
+        validation_alias='LOGIN_BACKOFF_MAX',
+        default=900.0  # in seconds
+    )
+    login_failure_window: float = Field(
+        validation_alias='LOGIN_FAILURE_WINDOW',
+        default=900.0  # in seconds after the last failure before it is forgotten
+    )
+    compression_enabled: bool = Field(
+        validation_alias='COMPRESSION_ENABLED',
+        default=True
+    )
+    compression_encodings: list[str] = Field(
+        validation_alias='COMPRESSION_ENCODINGS',
+        default=['zstd', 'br', 'gzip']  # in order of preference, br and zstd need brotli or zstandard installed
+    )
+    compression_min_size: int = Field(
+        validation_alias='COMPRESSION_MIN_SIZE',
+        default=1024  # in bytes, smaller bodies are sent as they are
+    )
+    compression_offload_size: int = Field(
+        validation_alias='COMPRESSION_OFFLOAD_SIZE',
+        default=256 * 1024  # in bytes, larger bodies are compressed off the event loop
+    )
+    compression_gzip_level: int = Field(
+        validation_alias='COMPRESSION_GZIP_LEVEL',
+        default=6
+    )
+    compression_brotli_quality: int = Field(
+        validation_alias='COMPRESSION_BROTLI_QUALITY',
+        default=4
+    )
+    compression_zstd_level: int = Field(
+        validation_alias='COMPRESSION_ZSTD_LEVEL',
+        default=3
+    )
+    compression_cache_bytes: int = Field(
+        validation_alias='COMPRESSION_CACHE_BYTES',
+        default=16 * 1024 * 1024  # compressed bytes kept for repeated bodies, 0 disables it
+    )
+    compression_cache_max_body_size: int = Field(
+        validation_alias='COMPRESSION_CACHE_MAX_BODY_SIZE',
+        default=1024 * 1024  # in bytes
+    )
+    profiling_enabled: bool = Field(
+        validation_alias='PROFILING_ENABLED',
+        default=True
+    )
+    profiling_header: str = Field(
+        validation_alias='PROFILING_HEADER',
+        default='X-Profile-Token'
+    )
+    profiling_sample_rate: float = Field(
+        validation_alias='PROFILING_SAMPLE_RATE',
+        default=0.0  # share of requests profiled without a profile token
+    )
+    profiling_max_profiles: int = Field(
+        validation_alias='PROFILING_MAX_PROFILES',
+        default=50  # the oldest profiles are dropped first
+    )
+    profiling_token_exp_delta: int = Field(
+        validation_alias='PROFILING_TOKEN_EXP_DELTA',
+        default=15  # in minutes
+    )
+    cache_backend: Literal['local', 'shared'] = Field(
+        validation_alias='CACHE_BACKEND',
+        default='local'
+    )
+    cache_namespaces: dict[str, dict] = Field(
+        validation_alias='CACHE_NAMESPACES',
+        default={}  # JSON object of namespace to maxsize, ttl, policy, stale_ttl or shared
+    )
+    cache_shared_slots: int = Field(
+        validation_alias='CACHE_SHARED_SLOTS',
+        default=8192
+    )
+    cache_shared_slot_size: int = Field(
+        validation_alias='CACHE_SHARED_SLOT_SIZE',
+        default=2048  # in bytes, larger entries stay in the local tier only
+    )
+    server_host: str = Field(
+        validation_alias='SERVER_HOST',
+        default='0.0.0.0'
+    )
+    server_port: int = Field(
+        validation_alias='SERVER_PORT',
+        default=8000
+    )
+    server_workers: int | None = Field(
+        validation_alias='SERVER_WORKERS',
+        default=None  # defaults to the cores available to the process
+    )
+    server_max_requests: int | None = Field(
+        validation_alias='SERVER_MAX_REQUESTS',
+        default=None  # workers are recycled after this many requests
+    )
+    server_max_requests_jitter: int = Field(
+        validation_alias='SERVER_MAX_REQUESTS_JITTER',
+        default=0  # spreads recycling so workers do not restart together
+    )
+    server_max_memory_mb: float | None = Field(
+        validation_alias='SERVER_MAX_MEMORY_MB',
+        default=None  # workers are recycled once their RSS exceeds this
+    )
+    server_graceful_timeout: float = Field(
+        validation_alias='SERVER_GRACEFUL_TIMEOUT',
+        default=30.0  # in seconds
+    )
+    server_forwarded_allow_ips: str = Field(
+        validation_alias='SERVER_FORWARDED_ALLOW_IPS',
+        default='127.0.0.1'  # comma separated proxy addresses or networks whose X-Forwarded-For is trusted
+    )
     public_key: str = Field(
         validation_alias='PUBLIC_KEY'
     )
@@ -19,5 +19,124 @@ class Settings(BaseSettings):
     db_pw: str = Field(validation_alias='POSTGRES_PASSWORD')
     db_name: str = Field(validation_alias='POSTGRES_DB')
 
+    pool_size: int = Field(
+        validation_alias='DB_POOL_SIZE',
+        default=5
+    )
+    pool_max_overflow: int = Field(
+        validation_alias='DB_POOL_MAX_OVERFLOW',
+        default=10
+    )
+    pool_timeout: float = Field(
+        validation_alias='DB_POOL_TIMEOUT',
+        default=30.0  # in seconds
+    )
+    pool_recycle: int = Field(
+        validation_alias='DB_POOL_RECYCLE',
+        default=1800  # in seconds, -1 disables recycling
+    )
+    pool_pre_ping: bool = Field(
+        validation_alias='DB_POOL_PRE_PING',
+        default=True
+    )
+    pool_use_lifo: bool = Field(
+        validation_alias='DB_POOL_USE_LIFO',
+        default=False
+    )
+    connect_timeout: float = Field(
+        validation_alias='DB_CONNECT_TIMEOUT',
+        default=5.0  # in seconds
+    )
+
+    circuit_window: float = Field(
+        validation_alias='DB_CIRCUIT_WINDOW',
+        default=30.0  # in seconds
+    )
+    circuit_min_attempts: int = Field(
+        validation_alias='DB_CIRCUIT_MIN_ATTEMPTS',
+        default=5  # connection attempts in the window before the circuit can open
+    )
+    circuit_failure_rate: float = Field(
+        validation_alias='DB_CIRCUIT_FAILURE_RATE',
+        default=0.5
+    )
+    circuit_open_for: float = Field(
+        validation_alias='DB_CIRCUIT_OPEN_SECONDS',
+        default=10.0  # in seconds
+    )
+    circuit_half_open_probes: int = Field(
+        validation_alias='DB_CIRCUIT_HALF_OPEN_PROBES',
+        default=2
+    )
+
+    external_pooler: bool = Field(
+        validation_alias='DB_EXTERNAL_POOLER',
+        default=False  # set when connecting through pgbouncer in transaction mode
+    )
+    external_pooler_local_pool: bool = Field(
+        validation_alias='DB_EXTERNAL_POOLER_LOCAL_POOL',
+        default=False  # keep a local pool in front of the external pooler instead of NullPool
+    )
+    statement_cache_size: int | None = Field(
+        validation_alias='DB_STATEMENT_CACHE_SIZE',
+        default=None  # 100 by default, 0 behind an external pooler
+    )
+    session_settings: dict[str, str] = Field(
+        validation_alias='DB_SESSION_SETTINGS',
+        default={}  # JSON object of run-time parameters, e.g. {"statement_timeout": "5s"}
+    )
+
+    replica_urls: list[str] = Field(
+        validation_alias='POSTGRES_REPLICA_URLS',
+        default=[]  # JSON list of postgresql+asyncpg:// DSNs
+    )
+    replica_max_lag_ms: int = Field(
+        validation_alias='POSTGRES_REPLICA_MAX_LAG_MS',
+        default=1000
+    )
+    replica_lag_check_interval: float = Field(
+        validation_alias='POSTGRES_REPLICA_LAG_CHECK_INTERVAL',
+        default=5.0  # in seconds
+    )
+    read_your_writes_window: float = Field(
+        validation_alias='READ_YOUR_WRITES_WINDOW',
+        default=5.0  # in seconds
+    )
+
+    n_plus_one_threshold: int = Field(
+        validation_alias='DB_N_PLUS_ONE_THRESHOLD',
+        default=5  # executions of one statement per request before it is flagged
+    )
+    server_timing_enabled: bool = Field(
+        validation_alias='DB_SERVER_TIMING_ENABLED',
+        default=True
+    )
+
+    slow_query_threshold_ms: float = Field(
+        validation_alias='DB_SLOW_QUERY_THRESHOLD_MS',
+        default=200.0
+    )
+    statement_stats_max_entries: int = Field(
+        validation_alias='DB_STATEMENT_STATS_MAX_ENTRIES',
+        default=500
+    )
+    explain_slow_queries: bool = Field(
+        validation_alias='DB_EXPLAIN_SLOW_QUERIES',
+        default=True
+    )
+    explain_interval: float = Field(
+        validation_alias='DB_EXPLAIN_INTERVAL',
+        default=300.0  # in seconds, per fingerprint
+    )
+
+    batch_max_size: int = Field(
+        validation_alias='DB_BATCH_MAX_SIZE',
+        default=100
+    )
+    warmup_pool_connections: int | None = Field(
+        validation_alias='DB_WARMUP_POOL_CONNECTIONS',
+        default=None  # defaults to DB_POOL_SIZE
+    )
+
 
 settings = Settings()
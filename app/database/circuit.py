@@ -0,0 +1,193 @@
+import logging
+
+from collections import deque
+from time import monotonic
+from sqlalchemy.exc import SQLAlchemyError
+
+from ..configs import (
+    core_configs,
+    db_configs
+)
+from ..utils.metrics import registry
+
+logger = logging.getLogger(f'{core_configs.logger_name}.database')
+
+CLOSED: str = 'closed'
+OPEN: str = 'open'
+HALF_OPEN: str = 'half_open'
+
+db_circuit_rejections_total = registry.counter(
+    'db_circuit_rejections_total',
+    'Connection attempts rejected while the database circuit was open.'
+)
+
+
+class DatabaseUnavailableError(SQLAlchemyError):
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after: float = retry_after
+
+
+class CircuitOpenError(DatabaseUnavailableError):
+    def __init__(self, retry_after: float):
+        super().__init__('The database circuit is open, no connection was attempted.', retry_after)
+
+
+class CircuitBreaker:
+    """
+    Tracks the outcome of every new database connection over a rolling
+    `window`. Once at least `min_attempts` were made and the share of
+    failures reaches `failure_rate`, the circuit opens and connection
+    attempts fail at once for `open_for` seconds. After that it is half
+    open: up to `half_open_probes` attempts go through, the circuit closes
+    when all of them succeed and opens again on the first failure.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        min_attempts: int,
+        failure_rate: float,
+        open_for: float,
+        half_open_probes: int
+    ):
+        self.window: float = window
+        self.min_attempts: int = min_attempts
+        self.failure_rate: float = failure_rate
+        self.open_for: float = open_for
+        self.half_open_probes: int = max(1, half_open_probes)
+        self.state: str = CLOSED
+        self.opened_at: float = 0.0
+        self.rejections: int = 0
+        self.transitions: int = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._failures: int = 0
+        self._probes_started: int = 0
+        self._probes_succeeded: int = 0
+
+    def _transition(self, state: str, now: float) -> None:
+        logger.warning('Database circuit changed from %s to %s', self.state, state)
+        self.state = state
+        self.transitions += 1
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+        if state == OPEN:
+            self.opened_at = now
+
+        if state == CLOSED:
+            self._outcomes.clear()
+            self._failures = 0
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            _, succeeded = self._outcomes.popleft()
+            self._failures -= not succeeded
+
+    def before_attempt(self) -> None:
+        now = monotonic()
+
+        if self.state == OPEN:
+            if now - self.opened_at < self.open_for:
+                self.rejections += 1
+                db_circuit_rejections_total.inc()
+                raise CircuitOpenError(self.opened_at + self.open_for - now)
+
+            self._transition(HALF_OPEN, now)
+
+        if self.state == HALF_OPEN:
+            if self._probes_started >= self.half_open_probes:
+                self.rejections += 1
+                db_circuit_rejections_total.inc()
+                raise CircuitOpenError(1.0)
+
+            self._probes_started += 1
+
+    def record_success(self) -> None:
+        now = monotonic()
+
+        if self.state == HALF_OPEN:
+            self._probes_succeeded += 1
+
+            if self._probes_succeeded >= self.half_open_probes:
+                self._transition(CLOSED, now)
+
+            return
+
+        self._outcomes.append((now, True))
+        self._trim(now)
+
+    def release_probe(self) -> None:
+        # an attempt that ended without an outcome, so a new probe may take its slot
+        if self.state == HALF_OPEN and self._probes_started > 0:
+            self._probes_started -= 1
+
+    def record_failure(self) -> None:
+        now = monotonic()
+
+        if self.state == HALF_OPEN:
+            self._transition(OPEN, now)
+            return
+
+        self._outcomes.append((now, False))
+        self._failures += 1
+        self._trim(now)
+
+        if len(self._outcomes) >= self.min_attempts and self._failures / len(self._outcomes) >= self.failure_rate:
+            self._transition(OPEN, now)
+
+    def to_dict(self) -> dict:
+        self._trim(monotonic())
+
+        return {
+            'state': self.state,
+            'attempts': len(self._outcomes),
+            'failures': self._failures,
+            'rejections': self.rejections,
+            'transitions': self.transitions,
+            'retry_after': round(max(0.0, self.opened_at + self.open_for - monotonic()), 3) if self.state == OPEN else None
+        }
+
+    def on_connect(self, dialect, connection_record, cargs, cparams):
+        # replaces the default connect so that the outcome can be recorded
+        self.before_attempt()
+
+        try:
+            connection = dialect.connect(*cargs, **cparams)
+        except OSError as e:
+            # refused and timed out connects are not DBAPI errors, so they
+            # would otherwise bypass every SQLAlchemyError handler
+            self.record_failure()
+            raise DatabaseUnavailableError(f'Could not connect to the database: {e}', 1.0) from e
+        except Exception:
+            self.record_failure()
+            raise
+        except BaseException:
+            # asyncio.CancelledError from client disconnects and probe timeouts
+            # says nothing about the database, but the half-open slot must be
+            # freed or the circuit never closes again
+            self.release_probe()
+            raise
+
+        self.record_success()
+        return connection
+
+
+db_circuit_breaker = CircuitBreaker(
+    window=db_configs.circuit_window,
+    min_attempts=db_configs.circuit_min_attempts,
+    failure_rate=db_configs.circuit_failure_rate,
+    open_for=db_configs.circuit_open_for,
+    half_open_probes=db_configs.circuit_half_open_probes
+)
+
+
+__all__ = [
+    'CLOSED',
+    'OPEN',
+    'HALF_OPEN',
+    'CircuitBreaker',
+    'CircuitOpenError',
+    'DatabaseUnavailableError',
+    'db_circuit_breaker'
+]
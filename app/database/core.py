@@ -1,8 +1,26 @@
 import logging
+import os
 
-from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+from time import time
+from contextlib import asynccontextmanager
+from fastapi.requests import Request
+from uuid import uuid4
+from sqlalchemy import (
+    event,
+    text
+)
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.orm import Session as SyncSession
+from starlette.status import (
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE
+)
 from fastapi.exceptions import HTTPException
-from typing import AsyncGenerator
+from typing import (
+    AsyncGenerator,
+    Callable
+)
 from sqlalchemy.engine.url import URL
 from sqlalchemy.ext.asyncio.scoping import async_scoped_session
 from sqlalchemy.ext.asyncio.session import (
@@ -15,13 +33,19 @@ from sqlalchemy.ext.asyncio.engine import (
     create_async_engine
 )
 
+from .circuit import (
+    DatabaseUnavailableError,
+    db_circuit_breaker
+)
+from .pool import InstrumentedAsyncQueuePool
+from ..utils.core import format_retry_after
 from ..utils.request import get_request_id
 from ..configs import (
     core_configs,
     db_configs
 )
 
-logger = logging.getLogger(core_configs.logger_name)
+logger = logging.getLogger(f'{core_configs.logger_name}.database')
 
 url_object: URL = URL.create(
     drivername='postgresql+asyncpg',
@@ -32,14 +56,95 @@ url_object: URL = URL.create(
     database=db_configs.db_name
 )
 
-async_engine: AsyncEngine = create_async_engine(
-    url=url_object,
-    echo=False,
-    future=True
-)
 
-async_session_factory = async_sessionmaker(
-    bind=async_engine,
+def _get_connect_args() -> dict:
+    default_cache_size = 0 if db_configs.external_pooler else 100
+    cache_size = db_configs.statement_cache_size
+
+    connect_args = {
+        'timeout': db_configs.connect_timeout,
+        'statement_cache_size': default_cache_size if cache_size is None else cache_size,
+        'prepared_statement_cache_size': default_cache_size if cache_size is None else cache_size
+    }
+
+    if db_configs.external_pooler:
+        # transaction pooling may hand each transaction a different backend,
+        # so prepared statement names must never collide across connections
+        connect_args['prepared_statement_name_func'] = lambda: f'__asyncpg_{uuid4().hex}__'
+    elif db_configs.session_settings:
+        connect_args['server_settings'] = db_configs.session_settings
+
+    return connect_args
+
+
+def get_engine_options() -> dict:
+    options = {
+        'echo': False,
+        'future': True,
+        'connect_args': _get_connect_args()
+    }
+
+    if db_configs.external_pooler and not db_configs.external_pooler_local_pool:
+        options['poolclass'] = NullPool
+        return options
+
+    options.update({
+        'poolclass': InstrumentedAsyncQueuePool,
+        'pool_size': db_configs.pool_size,
+        'max_overflow': db_configs.pool_max_overflow,
+        'pool_timeout': db_configs.pool_timeout,
+        'pool_recycle': db_configs.pool_recycle,
+        'pool_pre_ping': db_configs.pool_pre_ping,
+        'pool_use_lifo': db_configs.pool_use_lifo
+    })
+
+    return options
+
+
+_engine: AsyncEngine | None = None
+
+
+def get_engine() -> AsyncEngine:
+    global _engine
+
+    # created on first use, since building the engine loads the asyncpg
+    # dialect and is the slowest part of importing the app
+    if _engine is None:
+        _engine = create_async_engine(
+            url=url_object,
+            **get_engine_options()
+        )
+        event.listen(_engine.sync_engine, 'do_connect', db_circuit_breaker.on_connect)
+        async_session_factory.configure(bind=_engine)
+
+    return _engine
+
+
+async def dispose_engine() -> None:
+    global _engine
+
+    if _engine is not None:
+        await _engine.dispose()
+        _engine = None
+
+
+def _discard_inherited_engine() -> None:
+    # pooled connections opened before a fork belong to the parent, so the
+    # child drops them without closing and opens its own on first use
+    if _engine is not None:
+        _engine.sync_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=_discard_inherited_engine)
+
+
+class LazyEngineSessionmaker(async_sessionmaker):
+    def __call__(self, **local_kw) -> AsyncSession:
+        get_engine()
+        return super().__call__(**local_kw)
+
+
+async_session_factory = LazyEngineSessionmaker(
     class_=AsyncSession,
     expire_on_commit=False
 )
@@ -50,21 +155,75 @@ Session = async_scoped_session(
 )
 
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+def _build_session_settings_statement(session_settings: dict[str, str]) -> TextClause | None:
+    if not session_settings:
+        return None
+
+    params: dict[str, str] = {}
+    set_configs: list[str] = []
+
+    for i, (key, value) in enumerate(session_settings.items()):
+        params.update({f'key_{i}': key, f'value_{i}': value})
+        set_configs.append(f'set_config(:key_{i}, :value_{i}, true)')
+
+    return text(f'SELECT {", ".join(set_configs)}').bindparams(**params)
+
+
+_session_settings_statement = _build_session_settings_statement(db_configs.session_settings)
+
+
+@event.listens_for(SyncSession, 'after_begin')
+def _apply_session_settings(session: SyncSession, transaction, connection) -> None:
+    # server_settings are only sent at connection startup, which an external
+    # pooler does not preserve per transaction
+    if db_configs.external_pooler and _session_settings_statement is not None:
+        connection.execute(_session_settings_statement)
+
+
+@event.listens_for(SyncSession, 'after_commit')
+def _mark_write(session: SyncSession) -> None:
+    request_state = session.info.get('request_state')
+
+    if request_state is not None:
+        request_state.db_last_write = time()
+
+
+@asynccontextmanager
+async def session_scope(
+    session_factory: Callable[[], AsyncSession],
+    request: Request
+) -> AsyncGenerator[AsyncSession, None]:
     try:
-        async with Session() as session:
-            logger.info(f'Initialized database session for request: {get_request_id()}.')
+        async with session_factory() as session:
+            session.info['request_state'] = request.state
+            logger.info('Initialized database session for request: %s.', get_request_id())
             yield session
     except Exception as e:
-        logger.error(f'Database error: {e}')
+        logger.error('Database error: %s', e)
 
         if isinstance(e, HTTPException):
             raise HTTPException(
                 status_code=e.status_code,
-                detail=str(e)
+                detail=e.detail,
+                headers=e.headers
+            )
+
+        if isinstance(e, DatabaseUnavailableError):
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail='The database is unavailable. Try again later.',
+                headers={'Retry-After': format_retry_after(e.retry_after)}
             )
 
         raise HTTPException(
             status_code=HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
+            detail='Unexpected database error.'
         )
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    try:
+        async with session_scope(Session, request) as session:
+            yield session
+    finally:
+        await Session.remove()
@@ -1,19 +1,40 @@
 from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from time import perf_counter_ns
 
-from .core import async_engine
+from .profiler import get_query_profile
+from .statements import (
+    SKIP_FINGERPRINT_OPTION,
+    statement_stats
+)
 
-from ..utils.cache import set_cache
-from ..utils.request import get_request_id
+from ..utils.request import get_route_path
 
 
-@event.listens_for(async_engine.sync_engine, 'before_cursor_execute')
+# registered on the Engine class so engines created later, including the
+# replica engines, are covered as well
+@event.listens_for(Engine, 'before_cursor_execute')
 def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     context._query_start_time = perf_counter_ns()
 
 
-@event.listens_for(async_engine.sync_engine, 'after_cursor_execute')
+@event.listens_for(Engine, 'after_cursor_execute')
 def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
     end_time = perf_counter_ns()
     duration_ns = end_time - context._query_start_time
-    set_cache(get_request_id(), duration_ns)
+
+    # internal diagnostics such as EXPLAIN captures are not request work
+    if context.execution_options.get(SKIP_FINGERPRINT_OPTION, False):
+        return
+
+    profile = get_query_profile()
+
+    if profile is not None:
+        profile.record(statement, duration_ns, cursor.rowcount)
+
+    statement_stats.record(
+        statement=statement,
+        parameters=None if executemany else parameters,
+        duration_ns=duration_ns,
+        route=get_route_path()
+    )
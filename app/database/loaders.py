@@ -0,0 +1,205 @@
+import asyncio
+import logging
+
+from uuid import UUID
+from time import perf_counter_ns
+from contextvars import Context
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Hashable,
+    TypeVar
+)
+
+from fastapi.requests import Request
+from sqlalchemy.ext.asyncio.session import async_sessionmaker
+from sqlalchemy import (
+    select,
+    any_,
+    bindparam
+)
+
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID as PG_UUID
+)
+
+from .core import async_session_factory
+from .profiler import (
+    QueryProfile,
+    start_query_profile,
+    get_query_profile
+)
+from .replicas import (
+    replica_router,
+    is_recent_writer
+)
+from ..models.user import UserModel
+from ..configs import (
+    core_configs,
+    db_configs
+)
+
+logger = logging.getLogger(core_configs.logger_name)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class BatchLoaderStats:
+    def __init__(self):
+        self.batches: int = 0
+        self.keys: int = 0
+        self.errors: int = 0
+        self.last_ns: int = 0
+        self.max_ns: int = 0
+        self.total_ns: int = 0
+
+    def record(self, size: int, duration_ns: int, failed: bool = False) -> None:
+        self.batches += 1
+        self.keys += size
+        self.errors += int(failed)
+        self.last_ns = duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.total_ns += duration_ns
+
+    def to_dict(self) -> dict:
+        avg_ns = self.total_ns / self.batches if self.batches else 0
+
+        return {
+            'batches': self.batches,
+            'keys': self.keys,
+            'errors': self.errors,
+            'avg_batch_size': round(self.keys / self.batches, 2) if self.batches else 0,
+            'last_batch_ms': round(self.last_ns / 1_000_000, 4),
+            'avg_batch_ms': round(avg_ns / 1_000_000, 4),
+            'max_batch_ms': round(self.max_ns / 1_000_000, 4)
+        }
+
+
+class BatchLoader(Generic[K, V]):
+    """
+    Collects `load` calls issued during one event loop iteration and resolves
+    them with a single call to `batch_fn`, which must return a mapping of the
+    requested keys to values. Missing keys resolve to None.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[dict[K, V]]],
+        max_batch_size: int = 100
+    ):
+        self._batch_fn = batch_fn
+        self._max_batch_size = max(1, max_batch_size)
+        self._pending: dict[K, list[asyncio.Future]] = {}
+        self._profile: QueryProfile = QueryProfile()
+        self._scheduled: bool = False
+        self._tasks: set[asyncio.Task] = set()
+        self.stats = BatchLoaderStats()
+
+    async def load(self, key: K) -> V | None:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        batch_profile = self._profile
+
+        if len(self._pending) >= self._max_batch_size:
+            self._dispatch()
+        elif not self._scheduled:
+            self._scheduled = True
+            loop.call_soon(self._dispatch)
+
+        try:
+            return await future
+        finally:
+            # the batch is shared, so its queries count towards every request
+            # that waited for it, and so reach their Server-Timing headers
+            profile = get_query_profile()
+
+            if profile is not None and not future.cancelled():
+                profile.merge(batch_profile)
+
+    def _dispatch(self) -> None:
+        self._scheduled = False
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        profile, self._profile = self._profile, QueryProfile()
+        # run batches outside of the first caller's context so their
+        # queries are not attributed to that request alone
+        task = asyncio.get_running_loop().create_task(self._run(batch, profile), context=Context())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, list[asyncio.Future]], profile: QueryProfile) -> None:
+        start_query_profile(profile)
+        start_time_ns = perf_counter_ns()
+
+        try:
+            results = await self._batch_fn(list(batch))
+        except Exception as e:
+            self.stats.record(len(batch), perf_counter_ns() - start_time_ns, failed=True)
+            logger.error('Batch load of %d keys failed: %s', len(batch), e)
+
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        self.stats.record(len(batch), perf_counter_ns() - start_time_ns)
+
+        for key, futures in batch.items():
+            value = results.get(key)
+
+            for future in futures:
+                if not future.done():
+                    future.set_result(value)
+
+
+users_by_ids_statement = (
+    select(UserModel)
+    .where(UserModel.id == any_(bindparam('ids', type_=ARRAY(PG_UUID(as_uuid=True)))))
+)
+
+
+async def _load_users_by_ids(
+    session_factory: async_sessionmaker,
+    user_ids: list[UUID]
+) -> dict[UUID, UserModel]:
+    async with session_factory() as session:
+        results = await session.scalars(users_by_ids_statement, {'ids': user_ids})
+        return {db_user.id: db_user for db_user in results.all()}
+
+
+async def _load_users_from_primary(user_ids: list[UUID]) -> dict[UUID, UserModel]:
+    return await _load_users_by_ids(async_session_factory, user_ids)
+
+
+async def _load_users_from_replica(user_ids: list[UUID]) -> dict[UUID, UserModel]:
+    session_factory = replica_router.pick()
+    return await _load_users_by_ids(session_factory or async_session_factory, user_ids)
+
+
+user_loader: BatchLoader[UUID, UserModel] = BatchLoader(
+    batch_fn=_load_users_from_primary,
+    max_batch_size=db_configs.batch_max_size
+)
+
+replica_user_loader: BatchLoader[UUID, UserModel] = BatchLoader(
+    batch_fn=_load_users_from_replica,
+    max_batch_size=db_configs.batch_max_size
+)
+
+
+def get_user_loader(request: Request) -> BatchLoader[UUID, UserModel]:
+    if replica_router.enabled and not is_recent_writer(request):
+        return replica_user_loader
+
+    return user_loader
+
+
+__all__ = ['BatchLoader', 'user_loader', 'replica_user_loader', 'get_user_loader', 'users_by_ids_statement']
@@ -0,0 +1,149 @@
+from time import perf_counter_ns
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import (
+    Pool,
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry
+)
+
+_STATS_INFO_KEY: str = 'pool_stats'
+_CHECKOUT_INFO_KEY: str = 'checkout_ns'
+_RECENT_WAIT_WEIGHT: float = 0.2
+_RECENT_WAIT_HALF_LIFE_NS: int = 1_000_000_000
+
+
+class PoolStats:
+    def __init__(self):
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total_ns: int = 0
+        self.wait_max_ns: int = 0
+        self.hold_total_ns: int = 0
+        self.hold_max_ns: int = 0
+        self.checkins: int = 0
+        self.overflow_peak: int = 0
+        self.invalidations: int = 0
+        self.soft_invalidations: int = 0
+        self.recent_wait_ns: float = 0.0
+        self.recent_wait_at_ns: int = 0
+
+    def record_wait(self, duration_ns: int, timed_out: bool = False) -> None:
+        self.recent_wait_ns = self.recent_wait_estimate_ns() * (1 - _RECENT_WAIT_WEIGHT) + duration_ns * _RECENT_WAIT_WEIGHT
+        self.recent_wait_at_ns = perf_counter_ns()
+
+        if timed_out:
+            self.timeouts += 1
+            return
+
+        self.checkouts += 1
+        self.wait_total_ns += duration_ns
+        self.wait_max_ns = max(self.wait_max_ns, duration_ns)
+
+    def recent_wait_estimate_ns(self) -> float:
+        # decays while nothing is checked out, so shedding every request
+        # does not keep the estimate stuck at its last high value
+        age_ns = perf_counter_ns() - self.recent_wait_at_ns
+        return self.recent_wait_ns * 0.5 ** (age_ns / _RECENT_WAIT_HALF_LIFE_NS)
+
+    def record_hold(self, duration_ns: int) -> None:
+        self.checkins += 1
+        self.hold_total_ns += duration_ns
+        self.hold_max_ns = max(self.hold_max_ns, duration_ns)
+
+    def to_dict(self) -> dict:
+        return {
+            'checkouts': self.checkouts,
+            'timeouts': self.timeouts,
+            'avg_wait_ms': round(self.wait_total_ns / self.checkouts / 1_000_000, 4) if self.checkouts else 0,
+            'max_wait_ms': round(self.wait_max_ns / 1_000_000, 4),
+            'avg_hold_ms': round(self.hold_total_ns / self.checkins / 1_000_000, 4) if self.checkins else 0,
+            'max_hold_ms': round(self.hold_max_ns / 1_000_000, 4),
+            'recent_wait_ms': round(self.recent_wait_estimate_ns() / 1_000_000, 4),
+            'overflow_peak': self.overflow_peak,
+            'invalidations': self.invalidations,
+            'soft_invalidations': self.soft_invalidations
+        }
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+        self.waiting: int = 0
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start_time_ns = perf_counter_ns()
+        self.waiting += 1
+
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_wait(perf_counter_ns() - start_time_ns, timed_out=True)
+            raise
+        finally:
+            self.waiting -= 1
+
+        now_ns = perf_counter_ns()
+        self.stats.record_wait(now_ns - start_time_ns)
+        self.stats.overflow_peak = max(self.stats.overflow_peak, self.overflow())
+
+        record.info[_STATS_INFO_KEY] = self.stats
+        record.info[_CHECKOUT_INFO_KEY] = now_ns
+        return record
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        checkout_ns = record.info.pop(_CHECKOUT_INFO_KEY, None)
+
+        if checkout_ns is not None:
+            self.stats.record_hold(perf_counter_ns() - checkout_ns)
+
+        super()._do_return_conn(record)
+
+    def estimated_wait_ns(self) -> float:
+        # waits finish too late to show a pool that has just saturated, so the
+        # queue of waiters is also turned into an expected wait (Little's law)
+        if not self.waiting or not self.stats.checkins:
+            return self.stats.recent_wait_estimate_ns()
+
+        capacity = max(1, self.size() + max(0, self._max_overflow))
+        queued_ns = self.waiting * self.stats.hold_total_ns / self.stats.checkins / capacity
+        return max(self.stats.recent_wait_estimate_ns(), queued_ns)
+
+    def snapshot(self) -> dict:
+        return {
+            'size': self.size(),
+            'waiting': self.waiting,
+            'checked_out': self.checkedout(),
+            'checked_in': self.checkedin(),
+            'overflow': max(0, self.overflow()),
+            **self.stats.to_dict()
+        }
+
+
+# listeners are attached to the base class as async adapted pool classes
+# cannot be targeted directly; records of other pools carry no stats
+@event.listens_for(Pool, 'invalidate')
+def _on_invalidate(dbapi_connection, connection_record, exception):
+    stats: PoolStats | None = connection_record.info.get(_STATS_INFO_KEY)
+
+    if stats is not None:
+        stats.invalidations += 1
+
+
+@event.listens_for(Pool, 'soft_invalidate')
+def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+    stats: PoolStats | None = connection_record.info.get(_STATS_INFO_KEY)
+
+    if stats is not None:
+        stats.soft_invalidations += 1
+
+
+def get_pool_stats(pool) -> dict:
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        return pool.snapshot()
+
+    return {'pool': pool.status()}
+
+
+__all__ = ['InstrumentedAsyncQueuePool', 'PoolStats', 'get_pool_stats']
@@ -0,0 +1,90 @@
+from contextvars import (
+    ContextVar,
+    Token
+)
+
+from ..configs import db_configs
+
+_query_profile_ctx_var: ContextVar['QueryProfile | None'] = ContextVar('query_profile', default=None)
+
+
+class QueryProfile:
+    __slots__ = ('count', 'total_ns', 'max_ns', 'last_ns', 'rows', 'statements', 'merged')
+
+    def __init__(self):
+        self.count: int = 0
+        self.total_ns: int = 0
+        self.max_ns: int = 0
+        self.last_ns: int = 0
+        self.rows: int = 0
+        self.statements: dict[str, int] = {}
+        self.merged: set['QueryProfile'] = set()
+
+    def record(self, statement: str, duration_ns: int, rows: int) -> None:
+        self.count += 1
+        self.total_ns += duration_ns
+        self.max_ns = max(self.max_ns, duration_ns)
+        self.last_ns = duration_ns
+        self.rows += max(rows, 0)
+        self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def merge(self, other: 'QueryProfile') -> None:
+        # several loads of one request can wait for the same batch
+        if other in self.merged:
+            return
+
+        self.merged.add(other)
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+        self.last_ns = other.last_ns or self.last_ns
+        self.rows += other.rows
+
+        for statement, count in other.statements.items():
+            self.statements[statement] = self.statements.get(statement, 0) + count
+
+    @property
+    def repeated_statements(self) -> dict[str, int]:
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= db_configs.n_plus_one_threshold
+        }
+
+    def server_timing(self) -> str:
+        metrics = [
+            f'db;dur={self.total_ns / 1_000_000:.3f};desc="{self.count} queries, {self.rows} rows"',
+            f'db-max;dur={self.max_ns / 1_000_000:.3f}'
+        ]
+
+        repeated = self.repeated_statements
+
+        if repeated:
+            metrics.append(f'db-repeated;desc="{len(repeated)} repeated, max {max(repeated.values())} runs"')
+
+        return ', '.join(metrics)
+
+    def to_dict(self) -> dict:
+        return {
+            'queries': self.count,
+            'rows': self.rows,
+            'total_ms': round(self.total_ns / 1_000_000, 4),
+            'max_ms': round(self.max_ns / 1_000_000, 4),
+            'repeated_statements': self.repeated_statements
+        }
+
+
+def start_query_profile(profile: QueryProfile | None = None) -> tuple[QueryProfile, Token]:
+    profile = profile if profile is not None else QueryProfile()
+    return profile, _query_profile_ctx_var.set(profile)
+
+
+def get_query_profile() -> QueryProfile | None:
+    return _query_profile_ctx_var.get()
+
+
+def stop_query_profile(token: Token) -> None:
+    _query_profile_ctx_var.reset(token)
+
+
+__all__ = ['QueryProfile', 'start_query_profile', 'get_query_profile', 'stop_query_profile']
@@ -0,0 +1,185 @@
+import logging
+import os
+
+from functools import cached_property
+from time import (
+    monotonic,
+    time
+)
+
+from typing import AsyncGenerator
+from fastapi.requests import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio.session import (
+    AsyncSession,
+    async_sessionmaker
+)
+
+from sqlalchemy.ext.asyncio.engine import (
+    AsyncEngine,
+    create_async_engine
+)
+
+from .pool import get_pool_stats
+from .core import (
+    get_engine_options,
+    session_scope,
+    Session
+)
+
+from ..configs import (
+    core_configs,
+    db_configs
+)
+
+logger = logging.getLogger(core_configs.logger_name)
+
+LAST_WRITE_COOKIE: str = 'db_last_write'
+LAST_WRITE_HEADER: str = 'X-DB-Last-Write'
+
+_replication_lag_statement = text(
+    'SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 '
+    'ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) * 1000, 0) END'
+)
+
+
+class Replica:
+    def __init__(self, url: str):
+        self.url = make_url(url)
+        self.lag_ms: float | None = None
+        self.checked_at: float = 0.0
+
+    @cached_property
+    def engine(self) -> AsyncEngine:
+        return create_async_engine(
+            url=self.url,
+            **get_engine_options()
+        )
+
+    @cached_property
+    def session_factory(self) -> async_sessionmaker:
+        return async_sessionmaker(
+            bind=self.engine,
+            class_=AsyncSession,
+            expire_on_commit=False
+        )
+
+    async def refresh_lag(self) -> None:
+        # cleared first, so a check that is cancelled by its timeout leaves
+        # the replica unhealthy instead of keeping the previous reading
+        self.lag_ms = None
+        self.checked_at = monotonic()
+
+        try:
+            async with self.engine.connect() as conn:
+                self.lag_ms = float(await conn.scalar(_replication_lag_statement))
+        except Exception as e:
+            logger.error('Replica lag check failed for %s: %s', self.url.host, e)
+
+    async def dispose(self) -> None:
+        if 'engine' in self.__dict__:
+            await self.engine.dispose()
+            del self.__dict__['engine']
+            self.__dict__.pop('session_factory', None)
+
+    def discard_inherited(self) -> None:
+        if 'engine' in self.__dict__:
+            self.engine.sync_engine.dispose(close=False)
+
+    @property
+    def is_due(self) -> bool:
+        return monotonic() - self.checked_at >= db_configs.replica_lag_check_interval
+
+    @property
+    def is_healthy(self) -> bool:
+        # a reading that is no longer being refreshed says nothing about the lag now
+        refresh_interval = max(db_configs.replica_lag_check_interval, core_configs.health_probe_interval)
+        is_fresh = monotonic() - self.checked_at <= refresh_interval * 3
+
+        return is_fresh and self.lag_ms is not None and self.lag_ms <= db_configs.replica_max_lag_ms
+
+
+class ReplicaRouter:
+    def __init__(self, urls: list[str]):
+        self.replicas: list[Replica] = [Replica(url) for url in urls]
+        self._next: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> async_sessionmaker | None:
+        for _ in range(len(self.replicas)):
+            replica = self.replicas[self._next % len(self.replicas)]
+            self._next += 1
+
+            # lag is refreshed by the background health prober, never inline
+            if replica.is_healthy:
+                return replica.session_factory
+
+        return None
+
+    def stats(self) -> list[dict]:
+        return [{
+            'host': replica.url.host,
+            'healthy': replica.is_healthy,
+            'lag_ms': replica.lag_ms,
+            'pool': get_pool_stats(replica.engine.pool)
+        } for replica in self.replicas]
+
+    async def dispose(self) -> None:
+        for replica in self.replicas:
+            await replica.dispose()
+
+
+replica_router = ReplicaRouter(db_configs.replica_urls)
+
+
+def _discard_inherited_engines() -> None:
+    for replica in replica_router.replicas:
+        replica.discard_inherited()
+
+
+os.register_at_fork(after_in_child=_discard_inherited_engines)
+
+
+def _last_write_time(request: Request) -> float | None:
+    value = request.headers.get(LAST_WRITE_HEADER) or request.cookies.get(LAST_WRITE_COOKIE)
+
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_recent_writer(request: Request) -> bool:
+    last_write = _last_write_time(request)
+    return last_write is not None and time() - last_write < db_configs.read_your_writes_window
+
+
+async def get_read_session_factory(request: Request) -> async_sessionmaker | None:
+    if not replica_router.enabled or is_recent_writer(request):
+        return None
+
+    return replica_router.pick()
+
+
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    try:
+        session_factory = await get_read_session_factory(request)
+
+        async with session_scope(session_factory or Session, request) as session:
+            yield session
+    finally:
+        await Session.remove()
+
+
+__all__ = [
+    'LAST_WRITE_COOKIE',
+    'LAST_WRITE_HEADER',
+    'replica_router',
+    'is_recent_writer',
+    'get_read_session_factory',
+    'get_read_session'
+]
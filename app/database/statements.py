@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import json
+import logging
+import re
+
+from functools import lru_cache
+from time import monotonic
+from datetime import (
+    datetime,
+    timezone
+)
+
+from .core import get_engine
+from ..configs import (
+    core_configs,
+    db_configs
+)
+from ..utils.histogram import Histogram
+
+logger = logging.getLogger(core_configs.logger_name)
+
+SKIP_FINGERPRINT_OPTION: str = 'skip_fingerprint'
+
+_string_literal_regex = re.compile(r"'(?:[^']|'')*'")
+_numeric_literal_regex = re.compile(r'(?<![\w$])-?\d+(?:\.\d+)?\b')
+_parameter_regex = re.compile(r'(?:\$\d+|%\(\w+\)s|(?<!:):\w+)(?:::[\w\[\]]+)?')
+_value_list_regex = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+_whitespace_regex = re.compile(r'\s+')
+_explainable_regex = re.compile(r'^\s*(?:SELECT|INSERT|UPDATE|DELETE|WITH)\b', re.IGNORECASE)
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(statement: str) -> tuple[str, str]:
+    normalized = _string_literal_regex.sub('?', statement)
+    normalized = _parameter_regex.sub('?', normalized)
+    normalized = _numeric_literal_regex.sub('?', normalized)
+    normalized = _value_list_regex.sub('(?+)', normalized)
+    normalized = _whitespace_regex.sub(' ', normalized).strip()
+
+    return hashlib.blake2b(normalized.encode(), digest_size=8).hexdigest(), normalized
+
+
+class StatementStats:
+    __slots__ = ('fingerprint', 'statement', 'histogram', 'max_ms', 'slow_count', 'routes', 'explain', 'explained_at')
+
+    def __init__(self, fingerprint_id: str, statement: str):
+        self.fingerprint: str = fingerprint_id
+        self.statement: str = statement
+        self.histogram = Histogram()
+        self.max_ms: float = 0.0
+        self.slow_count: int = 0
+        self.routes: dict[str, int] = {}
+        self.explain: dict | None = None
+        self.explained_at: float | None = None
+
+    def record(self, duration_ms: float, route: str | None, is_slow: bool) -> None:
+        self.histogram.observe(duration_ms)
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.slow_count += int(is_slow)
+
+        if route is not None and (route in self.routes or len(self.routes) < 16):
+            self.routes[route] = self.routes.get(route, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            'fingerprint': self.fingerprint,
+            'statement': self.statement,
+            'calls': self.histogram.count,
+            'total_ms': round(self.histogram.sum, 4),
+            'mean_ms': round(self.histogram.sum / self.histogram.count, 4) if self.histogram.count else None,
+            'max_ms': round(self.max_ms, 4),
+            'slow_calls': self.slow_count,
+            'latency_histogram_ms': self.histogram.to_dict(),
+            'routes': self.routes,
+            'explain': self.explain,
+            'explained_at': (
+                datetime.fromtimestamp(self.explained_at, timezone.utc).isoformat()
+                if self.explained_at is not None else None
+            )
+        }
+
+
+class StatementStatsTable:
+    def __init__(self, max_entries: int):
+        self._max_entries: int = max(1, max_entries)
+        self._entries: dict[str, StatementStats] = {}
+        self._explain_tasks: set[asyncio.Task] = set()
+        self._explain_checked: dict[str, float] = {}
+
+    def record(
+        self,
+        statement: str,
+        parameters,
+        duration_ns: int,
+        route: str | None
+    ) -> None:
+        fingerprint_id, normalized = fingerprint(statement)
+        entry = self._entries.get(fingerprint_id)
+
+        if entry is None:
+            if len(self._entries) >= self._max_entries:
+                self._evict()
+
+            entry = self._entries[fingerprint_id] = StatementStats(fingerprint_id, normalized)
+
+        duration_ms = duration_ns / 1_000_000
+        is_slow = duration_ms >= db_configs.slow_query_threshold_ms
+        entry.record(duration_ms, route, is_slow)
+
+        if is_slow:
+            logger.warning('Slow query %s took %.2f ms on route %s: %s', fingerprint_id, duration_ms, route, normalized)
+            self._schedule_explain(entry, statement, parameters)
+
+    def _evict(self) -> None:
+        # drop the cheapest fingerprint so the expensive ones stay visible
+        victim = min(self._entries.values(), key=lambda entry: entry.histogram.sum)
+        del self._entries[victim.fingerprint]
+        self._explain_checked.pop(victim.fingerprint, None)
+
+    def _schedule_explain(self, entry: StatementStats, statement: str, parameters) -> None:
+        # parameters are None for executemany calls, which cannot be explained
+        if (
+            not db_configs.explain_slow_queries
+            or parameters is None
+            or self._explain_tasks
+            or not _explainable_regex.match(statement)
+        ):
+            return
+
+        checked_at = self._explain_checked.get(entry.fingerprint)
+
+        if checked_at is not None and monotonic() - checked_at < db_configs.explain_interval:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        self._explain_checked[entry.fingerprint] = monotonic()
+        task = loop.create_task(self._explain(entry, statement, parameters))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, entry: StatementStats, statement: str, parameters) -> None:
+        try:
+            async with get_engine().connect() as conn:
+                conn = await conn.execution_options(**{SKIP_FINGERPRINT_OPTION: True})
+                result = await conn.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters)
+                plan = result.scalar()
+                await conn.rollback()
+        except Exception as e:
+            logger.error('Failed to explain slow query %s: %s', entry.fingerprint, e)
+            return
+
+        entry.explain = json.loads(plan)[0] if isinstance(plan, str) else plan[0]
+        entry.explained_at = datetime.now(timezone.utc).timestamp()
+
+    def top(self, limit: int = 20, order_by: str = 'total_ms') -> list[dict]:
+        entries = [entry.to_dict() for entry in self._entries.values()]
+        entries.sort(key=lambda entry: entry.get(order_by) or 0, reverse=True)
+        return entries[:limit]
+
+    def reset(self) -> None:
+        self._entries.clear()
+        self._explain_checked.clear()
+
+
+statement_stats = StatementStatsTable(max_entries=db_configs.statement_stats_max_entries)
+
+
+__all__ = ['SKIP_FINGERPRINT_OPTION', 'fingerprint', 'statement_stats']
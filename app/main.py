@@ -7,7 +7,14 @@ from fastapi.exceptions import (
 )
 
 from .configs import core_configs
-from .middlewares import AddRequestIdMiddleware
+from .middlewares import (
+    AddRequestIdMiddleware,
+    ReadYourWritesMiddleware,
+    ProfilingMiddleware,
+    RateLimitMiddleware,
+    CompressionMiddleware,
+    AdmissionMiddleware
+)
 from .utils.lifespan import lifespan
 from .errors.error_handlers import (
     http_exception_handler,
@@ -18,7 +25,9 @@ from .errors.error_handlers import (
 from .routers import (
     HealthRouter,
     UserRouter,
-    AuthRouter
+    AuthRouter,
+    AdminRouter,
+    MetricsRouter
 )
 
 _api_version: str = core_configs.api_version.split('.')[0]
@@ -41,8 +50,17 @@ app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, request_validation_error_handler)
 app.add_exception_handler(ValidationError, schema_validation_error_handler)
 
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RateLimitMiddleware, api_prefix=api_prefix)
+app.add_middleware(AdmissionMiddleware, api_prefix=api_prefix)
 app.add_middleware(AddRequestIdMiddleware)
 
 app.include_router(HealthRouter, prefix=api_prefix)
 app.include_router(AuthRouter, prefix=api_prefix)
 app.include_router(UserRouter, prefix=api_prefix)
+app.include_router(AdminRouter, prefix=api_prefix)
+
+if core_configs.metrics_enabled:
+    app.include_router(MetricsRouter, prefix=api_prefix)
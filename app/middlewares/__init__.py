@@ -1 +1,8 @@
-from .request_middlewares import AddRequestIdMiddleware
+from .request_middlewares import (
+    AddRequestIdMiddleware,
+    ReadYourWritesMiddleware,
+    ProfilingMiddleware,
+    RateLimitMiddleware,
+    CompressionMiddleware,
+    AdmissionMiddleware
+)
@@ -1,36 +1,429 @@
 import logging
+import random
+import re
 
-from fastapi import Request
 from uuid import uuid4
+from urllib.parse import parse_qsl
 from time import perf_counter_ns
 from contextvars import Token
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import (
+    Headers,
+    MutableHeaders
+)
+from starlette.status import (
+    HTTP_429_TOO_MANY_REQUESTS,
+    HTTP_503_SERVICE_UNAVAILABLE
+)
+from starlette.responses import JSONResponse
+from fastapi.exceptions import HTTPException
+from starlette.types import (
+    ASGIApp,
+    Message,
+    Receive,
+    Scope,
+    Send
+)
 
-from ..configs import core_configs
+from ..configs import (
+    core_configs,
+    db_configs
+)
+from ..utils.metrics import (
+    registry,
+    http_requests_total,
+    http_request_duration_seconds,
+    http_requests_in_flight
+)
+from ..database.profiler import (
+    start_query_profile,
+    stop_query_profile
+)
+from ..database.replicas import (
+    LAST_WRITE_COOKIE,
+    LAST_WRITE_HEADER
+)
+from ..utils.profiling import (
+    RequestProfile,
+    profile_store
+)
+from ..utils.rate_limit import rate_limiter
+from ..utils.admission import admission_controller
+from ..utils.compression import (
+    StreamCompressor,
+    negotiate_encoding,
+    compress_chunk,
+    compressed_body_cache
+)
+from ..utils.core import (
+    json_encode_response_model,
+    format_retry_after
+)
+from ..schemas.response import ResponseModel
+from ..services.auth_service import (
+    validate_access_token,
+    validate_profile_token
+)
 from ..utils.request import (
     set_request_id,
-    remove_request_id
+    remove_request_id,
+    set_request_scope,
+    remove_request_scope,
+    get_route_path
 )
 
-logger = logging.getLogger(core_configs.logger_name)
+logger = logging.getLogger(f'{core_configs.logger_name}.requests')
+
+_request_id_regex = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+_compressible_types: tuple[str, ...] = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml'
+)
+
+rate_limit_decisions_total = registry.counter(
+    'rate_limit_decisions_total',
+    'Requests checked by the rate limiter by route group and result.',
+    ('group', 'result')
+)
+
+
+def _retry_later_response(status_code: int, message: str, retry_after: float) -> JSONResponse:
+    content = ResponseModel(
+        status=status_code,
+        success=False,
+        message=message
+    )
+
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content),
+        headers={'Retry-After': format_retry_after(retry_after)}
+    )
+
+
+def _get_inbound_request_id(scope: Scope) -> str | None:
+    if not core_configs.trust_request_id_header:
+        return None
+
+    request_id = Headers(scope=scope).get(core_configs.request_id_header)
+
+    if request_id is None or not _request_id_regex.match(request_id):
+        return None
+
+    return request_id
+
 
+class AddRequestIdMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-class AddRequestIdMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+    @staticmethod
+    def _record_metrics(scope: Scope, status_code: int, duration_ns: int) -> None:
+        # unmatched paths share one label to keep the series count bounded
+        labels = (get_route_path(scope) or 'unmatched', scope['method'], str(status_code))
+        http_requests_total.inc(labels)
+        http_request_duration_seconds.observe(duration_ns / 1_000_000_000, labels)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next):
         start_time_ns = perf_counter_ns()
-        request_id: str = str(uuid4().hex)
-        request.state.request_id = request_id
+        request_id: str = _get_inbound_request_id(scope) or uuid4().hex
+        scope.setdefault('state', {})['request_id'] = request_id
         ctx_token: Token = await set_request_id(request_id)
-        logger.info(f'Start processing request: {request_id}')
+        scope_token: Token = set_request_scope(scope)
+        profile, profile_token = start_query_profile()
+        status_code: int = 500
+        logger.info('Start processing request: %s', request_id)
+        http_requests_in_flight.inc()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+                headers = MutableHeaders(scope=message)
+                headers.append(core_configs.request_id_header, request_id)
+
+                if db_configs.server_timing_enabled:
+                    duration_ms: float = (perf_counter_ns() - start_time_ns) / 1_000_000
+                    headers.append('Server-Timing', f'{profile.server_timing()}, app;dur={duration_ms:.3f}')
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ns: int = perf_counter_ns() - start_time_ns
+            duration_ms: float = duration_ns / 1_000_000
+            http_requests_in_flight.dec()
+            self._record_metrics(scope, status_code, duration_ns)
+            logger.info('Finished processing request: %s in %.4f milliseconds', request_id, duration_ms)
+
+            if profile.count and logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    'Query profile for %s %s (%s): %s',
+                    scope['method'], get_route_path(scope), request_id, profile.to_dict()
+                )
+
+            stop_query_profile(profile_token)
+            remove_request_scope(scope_token)
+            await remove_request_id(ctx_token)
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            last_write: float | None = scope.get('state', {}).get('db_last_write')
+
+            if message['type'] == 'http.response.start' and last_write is not None:
+                max_age = max(1, int(db_configs.read_your_writes_window))
+                headers = MutableHeaders(scope=message)
+                headers.append(LAST_WRITE_HEADER, f'{last_write:.6f}')
+                headers.append(
+                    'Set-Cookie',
+                    f'{LAST_WRITE_COOKIE}={last_write:.6f}; HttpOnly; Max-Age={max_age}; Path=/; SameSite=lax'
+                )
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    async def _should_profile(scope: Scope) -> bool:
+        profile_token = Headers(scope=scope).get(core_configs.profiling_header)
+
+        if profile_token is not None:
+            return await validate_profile_token(profile_token)
+
+        return random.random() < core_configs.profiling_sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not core_configs.profiling_enabled or not await self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        start_time_ns = perf_counter_ns()
+        request_id: str = scope.get('state', {}).get('request_id') or uuid4().hex
+        profile = RequestProfile(request_id, scope['method'], scope['path'])
+        status_code: int | None = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+
+            await send(message)
+
+        try:
+            await profile.run(self.app(scope, receive, send_wrapper))
+        finally:
+            profile.finish(get_route_path(scope), status_code, perf_counter_ns() - start_time_ns)
+            profile_store.add(profile)
+
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, api_prefix: str = ''):
+        self.app = app
+        self.routes: dict[tuple[str, str], str] = {}
+
+        for route, group in core_configs.rate_limit_routes.items():
+            method, _, path = route.partition(' ')
+            self.routes[(method.upper(), f'{api_prefix}{path}'.rstrip('/'))] = group
+
+    @staticmethod
+    async def _get_subject(scope: Scope) -> str | None:
+        scheme, _, token = Headers(scope=scope).get('authorization', '').partition(' ')
+
+        if scheme.lower() != 'bearer' or not token:
+            return None
+
+        # valid tokens are served from the access_tokens cache after the first request
+        try:
+            payload, _ = await validate_access_token(token)
+        except HTTPException:
+            return None
+
+        return payload.get('sub')
+
+    @staticmethod
+    def _get_cost(scope: Scope, rule: dict) -> float:
+        page_size = rule.get('page_size')
+
+        if page_size is None:
+            return 1
+
+        # large pages cost more, so paging with a huge per_page drains the bucket
+        per_page = dict(parse_qsl(scope['query_string'].decode('latin-1'))).get('per_page', '')
+        return max(1, int(per_page) / page_size) if per_page.isdigit() else 1
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not core_configs.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        group = self.routes.get((scope['method'], scope['path'].rstrip('/')), 'default')
+        rule = core_configs.rate_limit_rules.get(group)
+
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        cost = self._get_cost(scope, rule)
+        client = scope.get('client')
+        keys = [f'ip:{group}:{client[0] if client else "unknown"}']
+        # checked before the token is verified, so a flood of made up tokens
+        # from one address is limited without paying for the signature checks
+        retry_after = rate_limiter.peek(keys[0], rule['rate'], rule['burst'], cost)
+
+        if retry_after <= 0:
+            subject = await self._get_subject(scope)
+
+            if subject is not None:
+                keys.append(f'sub:{group}:{subject}')
+
+            retry_after = rate_limiter.acquire_all(keys, rule['rate'], rule['burst'], cost)
+
+        if retry_after <= 0:
+            rate_limit_decisions_total.inc((group, 'allowed'))
+            await self.app(scope, receive, send)
+            return
+
+        rate_limit_decisions_total.inc((group, 'limited'))
+        response = _retry_later_response(HTTP_429_TOO_MANY_REQUESTS, 'Too many requests. Try again later.', retry_after)
+        await response(scope, receive, send)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    @staticmethod
+    def _is_compressible(message: Message) -> bool:
+        headers = Headers(raw=message['headers'])
+        content_type = headers.get('content-type', '').partition(';')[0].strip().lower()
+
+        return (
+            message['status'] not in (204, 304)
+            and 'content-encoding' not in headers
+            and (content_type.startswith(_compressible_types) or content_type.endswith(('+json', '+xml')))
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not core_configs.compression_enabled or scope['method'] == 'HEAD':
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        stream: StreamCompressor | None = None
+        passthrough: bool = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, stream, passthrough
+
+            if message['type'] == 'http.response.start':
+                if self._is_compressible(message):
+                    # held back until the first body chunk shows whether to compress
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+
+                return
+
+            if message['type'] != 'http.response.body' or passthrough:
+                await send(message)
+                return
+
+            body: bytes = message.get('body', b'')
+            more_body: bool = message.get('more_body', False)
+
+            if start_message is not None:
+                headers = MutableHeaders(scope=start_message)
+                headers.add_vary_header('Accept-Encoding')
+
+                if not more_body and len(body) < core_configs.compression_min_size:
+                    passthrough = True
+                    await send(start_message)
+                    await send(message)
+                    return
+
+                headers['Content-Encoding'] = encoding.name
+
+                # the ETag describes the uncompressed bytes
+                if 'etag' in headers and not headers['etag'].startswith('W/'):
+                    headers['ETag'] = f'W/{headers["etag"]}'
+
+                if not more_body:
+                    body = await compressed_body_cache.compress(encoding, body)
+                    headers['Content-Length'] = str(len(body))
+                    await send(start_message)
+                    await send({'type': 'http.response.body', 'body': body})
+                    return
+
+                del headers['Content-Length']
+                stream = encoding.stream()
+                await send(start_message)
+                start_message = None
+
+            chunk = await compress_chunk(stream, encoding, body) if body else b''
+
+            if not more_body:
+                chunk += stream.finish()
+
+            if chunk or not more_body:
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp, api_prefix: str = ''):
+        self.app = app
+        admission_controller.configure(api_prefix)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or not core_configs.admission_enabled:
+            await self.app(scope, receive, send)
+            return
 
-        response = await call_next(request)
+        priority = admission_controller.classify(scope['method'], scope['path'])
+        retry_after = admission_controller.try_admit(priority)
 
-        await remove_request_id(ctx_token)
-        duration_ns: int = perf_counter_ns() - start_time_ns
-        duration_ms: float = duration_ns / 1_000_000
-        logger.info(f'Finished processing request: {request_id} in {duration_ms:.4f} milliseconds')
+        if retry_after > 0:
+            response = _retry_later_response(
+                HTTP_503_SERVICE_UNAVAILABLE,
+                'The service is overloaded. Try again later.',
+                retry_after
+            )
+            await response(scope, receive, send)
+            return
 
-        return response
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_controller.release(priority)
@@ -1,3 +1,5 @@
 from .health_routes import router as HealthRouter
 from .user_routes import router as UserRouter
-from .auth_router import router as AuthRouter
\ No newline at end of file
+from .auth_router import router as AuthRouter
+from .admin_routes import router as AdminRouter
+from .metrics_routes import router as MetricsRouter
@@ -0,0 +1,92 @@
+from typing import Annotated
+from fastapi import (
+    APIRouter,
+    Depends
+)
+
+from fastapi.responses import (
+    JSONResponse,
+    PlainTextResponse
+)
+
+from .base import BulkheadRoute
+from ..schemas.response import ResponseModel
+from ..utils.core import json_encode_response_model
+from ..services.admin_service import (
+    fetch_query_stats,
+    reset_query_stats,
+    fetch_loop_stalls,
+    reset_loop_stalls,
+    issue_profile_token,
+    fetch_profiles,
+    fetch_profile,
+    reset_profiles
+)
+
+router = APIRouter(
+    prefix='/admin',
+    tags=['Administration'],
+    route_class=BulkheadRoute
+)
+
+
+@router.get(path='/queries')
+async def get_query_stats(content: Annotated[ResponseModel, Depends(fetch_query_stats)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.delete(path='/queries')
+async def clear_query_stats(content: Annotated[ResponseModel, Depends(reset_query_stats)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.get(path='/loop-stalls')
+async def get_loop_stalls(content: Annotated[ResponseModel, Depends(fetch_loop_stalls)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.delete(path='/loop-stalls')
+async def clear_loop_stalls(content: Annotated[ResponseModel, Depends(reset_loop_stalls)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.post(path='/profiles/token')
+async def create_profile_token(content: Annotated[ResponseModel, Depends(issue_profile_token)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.get(path='/profiles')
+async def get_profiles(content: Annotated[ResponseModel, Depends(fetch_profiles)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.get(path='/profiles/{request_id}', response_class=PlainTextResponse)
+async def get_profile(content: Annotated[str, Depends(fetch_profile)]) -> PlainTextResponse:
+    # collapsed stacks, e.g. `flamegraph.pl profile.txt > profile.svg`
+    return PlainTextResponse(content)
+
+
+@router.delete(path='/profiles')
+async def clear_profiles(content: Annotated[ResponseModel, Depends(reset_profiles)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
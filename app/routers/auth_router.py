@@ -6,6 +6,7 @@ from fastapi import (
 
 from fastapi.responses import JSONResponse
 
+from .base import BulkheadRoute
 from ..schemas.response import ResponseModel
 from ..utils.core import json_encode_response_model
 from ..services.auth_service import (
@@ -15,7 +16,8 @@ from ..services.auth_service import (
 
 router = APIRouter(
     prefix='/oauth',
-    tags=['Authentication']
+    tags=['Authentication'],
+    route_class=BulkheadRoute
 )
 
 
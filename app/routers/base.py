@@ -0,0 +1,31 @@
+from typing import (
+    Callable,
+    Coroutine,
+    Any
+)
+
+from fastapi.routing import APIRoute
+from fastapi.requests import Request
+from fastapi.responses import Response
+
+from ..utils.bulkhead import get_bulkhead
+
+
+class BulkheadRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+        # routes are isolated by the bulkhead of their router's tags, so a
+        # slow group of routes cannot take every connection of the pool
+        bulkhead = get_bulkhead(self.tags)
+
+        if bulkhead is None:
+            return route_handler
+
+        async def bulkhead_route_handler(request: Request) -> Response:
+            async with bulkhead.enter():
+                return await route_handler(request)
+
+        return bulkhead_route_handler
+
+
+__all__ = ['BulkheadRoute']
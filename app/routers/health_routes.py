@@ -6,13 +6,20 @@ from fastapi import (
 
 from fastapi.responses import JSONResponse
 
-from ..services.health_service import health_check
+from ..services.health_service import (
+    health_check,
+    liveness_check,
+    readiness_check,
+    deep_health_check
+)
+from .base import BulkheadRoute
 from ..schemas.response import ResponseModel
 from ..utils.core import json_encode_response_model
 
 router = APIRouter(
     prefix='/health',
-    tags=['Application Health']
+    tags=['Application Health'],
+    route_class=BulkheadRoute
 )
 
 
@@ -22,3 +29,27 @@ async def check_health(content: Annotated[ResponseModel, Depends(health_check)])
         status_code=content.status,
         content=json_encode_response_model(content)
     )
+
+
+@router.get(path='/live')
+async def check_liveness(content: Annotated[ResponseModel, Depends(liveness_check)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.get(path='/ready')
+async def check_readiness(content: Annotated[ResponseModel, Depends(readiness_check)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
+
+
+@router.get(path='/deep')
+async def check_deep_health(content: Annotated[ResponseModel, Depends(deep_health_check)]) -> JSONResponse:
+    return JSONResponse(
+        status_code=content.status,
+        content=json_encode_response_model(content)
+    )
@@ -0,0 +1,24 @@
+from typing import Annotated
+from fastapi import (
+    APIRouter,
+    Depends
+)
+
+from fastapi.responses import PlainTextResponse
+
+from .base import BulkheadRoute
+from ..services.metrics_service import export_metrics
+
+router = APIRouter(
+    prefix='/metrics',
+    tags=['Application Metrics'],
+    route_class=BulkheadRoute
+)
+
+
+@router.get(path='', response_class=PlainTextResponse)
+async def get_metrics(content: Annotated[str, Depends(export_metrics)]) -> PlainTextResponse:
+    return PlainTextResponse(
+        content=content,
+        media_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -6,6 +6,7 @@ from fastapi import (
 
 from fastapi.responses import JSONResponse
 
+from .base import BulkheadRoute
 from ..schemas.response import ResponseModel
 from ..utils.core import json_encode_response_model
 from ..services.user_service import (
@@ -21,7 +22,8 @@ from ..services.user_service import (
 
 router = APIRouter(
     prefix='/users',
-    tags=['Users']
+    tags=['Users'],
+    route_class=BulkheadRoute
 )
 
 
@@ -1,4 +1,3 @@
-from pycountry import currencies
 from typing import Literal
 from enum import (
     Enum,
@@ -31,6 +30,7 @@ class BaseEnum(Enum):
 class TokenType(BaseEnum):
     ACCESS_TOKEN = 'access_token'
     REFRESH_TOKEN = 'refresh_token'
+    PROFILE_TOKEN = 'profile_token'
 
 
 @unique
@@ -0,0 +1,202 @@
+"""
+Pre-forking launcher for multi-core deployments.
+
+    uv run python -m app.server
+
+The supervisor binds the listening socket, imports the app once and forks
+SERVER_WORKERS uvicorn workers that share the socket. Each worker creates
+its own engine and pool in the lifespan after the fork. Workers that exit,
+crash or are recycled after SERVER_MAX_REQUESTS requests or
+SERVER_MAX_MEMORY_MB of RSS are replaced. On SIGTERM or SIGINT the workers
+finish in-flight requests and close their pools before the supervisor exits.
+"""
+import logging
+import math
+import os
+import random
+import signal
+import socket
+import time
+
+import uvicorn
+
+from .configs import core_configs
+
+logger = logging.getLogger(core_configs.logger_name)
+
+
+def get_worker_count() -> int:
+    if core_configs.server_workers is not None:
+        return max(1, core_configs.server_workers)
+
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    # a cgroup v2 CPU quota caps containers below the cores they can see
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()
+
+        if quota != 'max':
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def _get_rss_mb() -> float:
+    from psutil import Process
+
+    return Process().memory_info().rss / (1024 * 1024)
+
+
+class WorkerServer(uvicorn.Server):
+    async def on_tick(self, counter: int) -> bool:
+        if await super().on_tick(counter):
+            return True
+
+        max_memory_mb = core_configs.server_max_memory_mb
+
+        if max_memory_mb is not None and counter % 10 == 0:
+            rss_mb = _get_rss_mb()
+
+            if rss_mb > max_memory_mb:
+                logger.warning(
+                    'Worker %d uses %.1f MB, above the %.1f MB limit. Recycling.',
+                    os.getpid(), rss_mb, max_memory_mb
+                )
+                return True
+
+        return False
+
+
+class Supervisor:
+    def __init__(self, config: uvicorn.Config, workers: int):
+        self.config: uvicorn.Config = config
+        self.workers: int = workers
+        self.children: dict[int, float] = {}
+        self.should_exit: bool = False
+
+    def _run_worker(self, sock: socket.socket) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, signal.SIG_DFL)
+
+        # the random state is inherited, so reseed before drawing the jitter
+        random.seed()
+
+        if core_configs.server_max_requests is not None:
+            self.config.limit_max_requests = (
+                core_configs.server_max_requests
+                + random.randint(0, core_configs.server_max_requests_jitter)
+            )
+
+        WorkerServer(self.config).run(sockets=[sock])
+
+    def _spawn(self, sock: socket.socket) -> None:
+        pid = os.fork()
+
+        if pid == 0:
+            exit_code = 0
+
+            try:
+                self._run_worker(sock)
+            except BaseException:
+                logger.exception('Worker %d failed', os.getpid())
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        self.children[pid] = time.monotonic()
+        logger.info('Started worker %d', pid)
+
+    def _handle_exit(self, sig: int, frame) -> None:
+        self.should_exit = True
+
+    def _reap(self) -> list[tuple[int, int, float]]:
+        exited = []
+
+        while self.children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+
+            if pid == 0:
+                break
+
+            started_at = self.children.pop(pid)
+            exited.append((pid, status, time.monotonic() - started_at))
+
+        return exited
+
+    def _stop_workers(self) -> None:
+        for pid in list(self.children):
+            os.kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + core_configs.server_graceful_timeout + 5
+
+        while self.children and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(0.1)
+
+        for pid in list(self.children):
+            logger.warning('Worker %d did not drain in time, killing it', pid)
+            os.kill(pid, signal.SIGKILL)
+
+        while self.children:
+            pid, _ = os.waitpid(-1, 0)
+            self.children.pop(pid, None)
+
+    def run(self) -> None:
+        sock = self.config.bind_socket()
+        # importing the app before forking shares its memory between workers;
+        # the engine is created lazily, so no connection crosses the fork
+        self.config.load()
+
+        signal.signal(signal.SIGINT, self._handle_exit)
+        signal.signal(signal.SIGTERM, self._handle_exit)
+
+        logger.info('Starting %d workers on %s:%d', self.workers, self.config.host, self.config.port)
+
+        for _ in range(self.workers):
+            self._spawn(sock)
+
+        while not self.should_exit:
+            for pid, status, uptime in self._reap():
+                logger.warning(
+                    'Worker %d exited with status %d after %.1f seconds, replacing it',
+                    pid, os.waitstatus_to_exitcode(status), uptime
+                )
+
+                # back off when workers fail during startup instead of spinning
+                if uptime < 1:
+                    time.sleep(1)
+
+                if not self.should_exit:
+                    self._spawn(sock)
+
+            time.sleep(0.1)
+
+        logger.info('Stopping %d workers', len(self.children))
+        self._stop_workers()
+        sock.close()
+
+
+def main() -> None:
+    config = uvicorn.Config(
+        app='app.main:app',
+        host=core_configs.server_host,
+        port=core_configs.server_port,
+        timeout_graceful_shutdown=core_configs.server_graceful_timeout,
+        # the client address, which rate limits key on, is taken from
+        # X-Forwarded-For only when the peer is one of these proxies
+        proxy_headers=True,
+        forwarded_allow_ips=core_configs.server_forwarded_allow_ips,
+        lifespan='on'
+    )
+
+    Supervisor(config, get_worker_count()).run()
+
+
+if __name__ == '__main__':
+    main()
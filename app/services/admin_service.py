@@ -0,0 +1,156 @@
+from typing import (
+    Annotated,
+    Literal
+)
+
+from fastapi import (
+    Depends,
+    HTTPException,
+    Path,
+    Query
+)
+
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_404_NOT_FOUND
+)
+
+from ..database.statements import statement_stats
+from ..schemas.response import ResponseModel
+from ..schemas.enums import (
+    UserType,
+    TokenType
+)
+from ..configs import core_configs
+from ..utils.profiling import profile_store
+from ..utils.loop_monitor import loop_monitor
+from ..services.auth_service import (
+    _generate_jwt_token,
+    validate_access_token,
+    identity_required
+)
+
+
+@identity_required([UserType.ADMIN])
+async def fetch_query_stats(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)],
+    limit: Annotated[int, Query(ge=1, le=500)] = 20,
+    order_by: Annotated[Literal['total_ms', 'mean_ms', 'max_ms', 'calls', 'slow_calls'], Query()] = 'total_ms'
+) -> ResponseModel:
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        payload=statement_stats.top(limit=limit, order_by=order_by)
+    )
+
+
+@identity_required([UserType.ADMIN])
+async def reset_query_stats(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> ResponseModel:
+    statement_stats.reset()
+
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        message='Query statistics reset successfully.'
+    )
+
+
+@identity_required([UserType.ADMIN])
+async def fetch_loop_stalls(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20
+) -> ResponseModel:
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        payload=loop_monitor.top(limit=limit)
+    )
+
+
+@identity_required([UserType.ADMIN])
+async def reset_loop_stalls(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> ResponseModel:
+    loop_monitor.reset()
+
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        message='Event loop stalls reset successfully.'
+    )
+
+
+@identity_required([UserType.ADMIN])
+async def issue_profile_token(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> ResponseModel:
+    payload, _ = token_returns
+    profile_token = await _generate_jwt_token(
+        data={'id': payload['id']},
+        token_type=TokenType.PROFILE_TOKEN,
+        exp_delta=core_configs.profiling_token_exp_delta
+    )
+
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        payload={
+            'header': core_configs.profiling_header,
+            'token': profile_token,
+            'expires_in': core_configs.profiling_token_exp_delta
+        }
+    )
+
+
+@identity_required([UserType.ADMIN])
+async def fetch_profiles(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> ResponseModel:
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        payload=profile_store.list()
+    )
+
+
+@identity_required([UserType.ADMIN])
+async def fetch_profile(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)],
+    request_id: Annotated[str, Path()]
+) -> str:
+    profile = profile_store.get(request_id)
+
+    if profile is None:
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND,
+            detail='No profile was recorded for this request.'
+        )
+
+    return profile.to_collapsed()
+
+
+@identity_required([UserType.ADMIN])
+async def reset_profiles(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> ResponseModel:
+    profile_store.clear()
+
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        message='Request profiles cleared successfully.'
+    )
+
+
+__all__ = [
+    'fetch_query_stats',
+    'reset_query_stats',
+    'fetch_loop_stalls',
+    'reset_loop_stalls',
+    'issue_profile_token',
+    'fetch_profiles',
+    'fetch_profile',
+    'reset_profiles'
+]
@@ -1,6 +1,7 @@
 import jwt
 import base64
 import json
+from time import time
 from functools import wraps
 from uuid import UUID
 
@@ -34,7 +35,8 @@ from starlette.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_401_UNAUTHORIZED,
     HTTP_403_FORBIDDEN,
-    HTTP_423_LOCKED
+    HTTP_423_LOCKED,
+    HTTP_429_TOO_MANY_REQUESTS
 )
 
 from sqlalchemy import (
@@ -43,11 +45,22 @@ from sqlalchemy import (
 )
 
 from ..database import get_session
+from ..database.loaders import (
+    BatchLoader,
+    get_user_loader
+)
 from ..models.user import UserModel as user
 from ..schemas.response import ResponseModel
 from ..schemas.request import LoginRequest
-from ..utils.security import verify_password
+from ..utils.security import (
+    verify_password,
+    get_signing_key,
+    get_verification_key
+)
 from ..utils.errors import handle_db_errors
+from ..utils.cache import cached
+from ..utils.core import format_retry_after
+from ..utils.rate_limit import login_throttle
 from ..configs.core import settings
 from ..schemas.enums import (
     GrantType,
@@ -84,7 +97,7 @@ async def _decode_token(token: str) -> tuple[dict, dict]:
         payload = jwt.decode(
             jwt=token,
             algorithms=[settings.token_algorithm],
-            key=base64.b64decode(settings.public_key),
+            key=get_verification_key(),
             audience=settings.token_audience,
             issuer=settings.token_issuer,
             options={
@@ -154,7 +167,7 @@ async def _generate_jwt_token(
     return jwt.encode(
         payload=to_encode,
         algorithm=settings.token_algorithm,
-        key=base64.b64decode(settings.private_key),
+        key=get_signing_key(),
         headers={'ttyp': token_type.value}
     )
 
@@ -163,6 +176,16 @@ async def _login_for_access_token(
     credentials: UserCredentials,
     session: Annotated[AsyncSession, Depends(get_session)]
 ) -> ResponseModel:
+    # checked before the lookup and the password hash, which are the expensive parts
+    retry_after = login_throttle.retry_after(credentials.identifier)
+
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=HTTP_429_TOO_MANY_REQUESTS,
+            detail='Too many failed login attempts. Try again later.',
+            headers={'Retry-After': format_retry_after(retry_after)}
+        )
+
     statement = (
         select(user)
         .where(or_(
@@ -183,7 +206,12 @@ async def _login_for_access_token(
             errors=err.errors
         )
 
+    # returns the connection to the pool before the password hash, which is
+    # slow and needs no database; db_user keeps its loaded attributes
+    await session.close()
+
     if db_user is None:
+        login_throttle.record_failure(credentials.identifier)
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
             detail='Invalid authentication credentials',
@@ -196,12 +224,14 @@ async def _login_for_access_token(
     )
 
     if not verified:
+        login_throttle.record_failure(credentials.identifier)
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
             detail='Invalid authentication credentials',
             headers={'WWW-Authenticate': 'Bearer'}
         )
 
+    login_throttle.reset(credentials.identifier)
     user_data = User.model_validate(db_user.to_dict())
 
     if not user_data.is_verified:
@@ -227,6 +257,7 @@ async def _login_for_access_token(
 
     if updated_pwd is not None:
         db_user.password = updated_pwd
+        session.add(db_user)
 
         try:
             await session.commit()
@@ -260,8 +291,22 @@ async def _login_for_access_token(
     )
 
 
+@cached('access_tokens', maxsize=4096, ttl=60.0, shared=True)
+async def _decode_access_token(token: str) -> tuple[dict, dict]:
+    # verifying the ES256 signature is the costly part of every authenticated request
+    return await _decode_token(token)
+
+
 async def validate_access_token(token: Annotated[str, Depends(oauth2_schema)]) -> tuple[dict, dict]:
-    payload, header = await _decode_token(token)
+    payload, header = await _decode_access_token(token)
+
+    # a cached payload may outlive the token it was decoded from
+    if payload['exp'] <= time():
+        raise HTTPException(
+            status_code=HTTP_401_UNAUTHORIZED,
+            detail='Token has expired.',
+            headers={'WWW-Authenticate': 'Bearer'}
+        )
 
     if not header.get('ttyp') == TokenType.ACCESS_TOKEN.value:
         raise HTTPException(
@@ -273,6 +318,15 @@ async def validate_access_token(token: Annotated[str, Depends(oauth2_schema)]) -
     return payload, header
 
 
+async def validate_profile_token(token: str) -> bool:
+    try:
+        _, header = await _decode_token(token)
+    except HTTPException:
+        return False
+
+    return header.get('ttyp') == TokenType.PROFILE_TOKEN.value
+
+
 async def generate_access_token(
     session: Annotated[AsyncSession, Depends(get_session)],
     login_request: LoginRequest
@@ -316,19 +370,13 @@ async def generate_access_token(
 
 
 async def verify_access_token(
-    session: Annotated[AsyncSession, Depends(get_session)],
+    loader: Annotated[BatchLoader[UUID, user], Depends(get_user_loader)],
     token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
 ) -> ResponseModel:
     payload = token_returns[0]
 
-    statement = (
-        select(user)
-        .where(user.id == payload['id'])
-    )
-
     try:
-        results = await session.scalars(statement)
-        db_user = results.one_or_none()
+        db_user = await loader.load(UUID(payload['id']))
     except SQLAlchemyError as e:
         err = await handle_db_errors(e)
         return ResponseModel(
@@ -378,4 +426,10 @@ def identity_required(required: list[UserType] | list = None):
     return decorator
 
 
-__all__ = ['generate_access_token', 'verify_access_token', 'validate_access_token', 'identity_required']
+__all__ = [
+    'generate_access_token',
+    'verify_access_token',
+    'validate_access_token',
+    'validate_profile_token',
+    'identity_required'
+]
@@ -1,25 +1,27 @@
 from fastapi import Depends
 from typing import Annotated
-from starlette.status import HTTP_200_OK
-from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy import text, Engine
+from starlette.status import (
+    HTTP_200_OK,
+    HTTP_503_SERVICE_UNAVAILABLE
+)
 
 from ..configs import core_configs
-from ..database import get_session
+from ..schemas.enums import UserType
 from ..schemas.response import ResponseModel
-from ..utils.core import (
-    get_api_uptime,
-    get_system_metrics,
-    get_db_response_time_ms
+from ..services.auth_service import (
+    validate_access_token,
+    identity_required
 )
+from ..utils.core import get_api_uptime
+from ..utils.health import health_prober
+from ..utils.warmup import warmup
 
 
 async def health_check(
-    session: Annotated[AsyncSession, Depends(get_session)],
-    uptime: Annotated[str, Depends(get_api_uptime)],
-    system_metrics: Annotated[dict, Depends(get_system_metrics)],
-    db_response_time: Annotated[float, Depends(get_db_response_time_ms)]
+    uptime: Annotated[str, Depends(get_api_uptime)]
 ) -> ResponseModel:
+    snapshot = health_prober.snapshot or {}
+
     return ResponseModel(
         status=HTTP_200_OK,
         success=True,
@@ -27,12 +29,80 @@ async def health_check(
             'api': 'healthy',
             'version': core_configs.api_version,
             'uptime': uptime,
-            'system_metrics': system_metrics,
+            'sampled_at': snapshot.get('sampled_at'),
+            'system_metrics': snapshot.get('system_metrics'),
+            'dependencies': {
+                'database': snapshot.get('database', {'status': 'unknown'})
+            }
+        }
+    )
+
+
+async def liveness_check(
+    uptime: Annotated[str, Depends(get_api_uptime)]
+) -> ResponseModel:
+    return ResponseModel(
+        status=HTTP_200_OK,
+        success=True,
+        payload={
+            'api': 'alive',
+            'version': core_configs.api_version,
+            'uptime': uptime
+        }
+    )
+
+
+async def readiness_check() -> ResponseModel:
+    snapshot = health_prober.snapshot or {}
+    is_ready = health_prober.is_ready
+
+    return ResponseModel(
+        status=HTTP_200_OK if is_ready else HTTP_503_SERVICE_UNAVAILABLE,
+        success=is_ready,
+        message=None if is_ready else 'Service is not ready to accept traffic.',
+        payload={
+            'api': 'ready' if is_ready else 'not ready',
+            'sampled_at': snapshot.get('sampled_at'),
+            'database': snapshot.get('database', {}).get('status', 'unknown'),
+            'warmup': {
+                'status': 'complete' if warmup.is_complete else 'pending',
+                'steps': warmup.steps
+            }
+        }
+    )
+
+
+def _aggregate_status(database: dict) -> str:
+    if database['status'] != 'healthy':
+        return 'unhealthy'
+
+    # reads fall back to the primary, so a lagging replica only degrades service
+    if any(not replica['healthy'] for replica in database.get('replicas', [])):
+        return 'degraded'
+
+    return 'healthy'
+
+
+@identity_required([UserType.ADMIN])
+async def deep_health_check(
+    uptime: Annotated[str, Depends(get_api_uptime)],
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> ResponseModel:
+    result = await health_prober.deep_check()
+    status = _aggregate_status(result['database'])
+    is_healthy = status != 'unhealthy'
+
+    return ResponseModel(
+        status=HTTP_200_OK if is_healthy else HTTP_503_SERVICE_UNAVAILABLE,
+        success=is_healthy,
+        payload={
+            'api': status,
+            'version': core_configs.api_version,
+            'uptime': uptime,
+            'sampled_at': result['sampled_at'],
+            'system_metrics': result['system_metrics'],
             'dependencies': {
-                'database': {
-                    'status': 'healthy' if session.is_active else 'unhealthy',
-                    'response_time_ms': db_response_time
-                }
+                'database': result['database']
             }
         }
     )
@@ -0,0 +1,141 @@
+from typing import Annotated
+from fastapi import Depends
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+
+from ..database.circuit import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    db_circuit_breaker
+)
+from ..database.core import get_engine
+from ..database.pool import InstrumentedAsyncQueuePool
+from ..database.replicas import replica_router
+from ..schemas.enums import UserType
+from ..services.auth_service import (
+    validate_access_token,
+    identity_required
+)
+from ..utils.cache import get_cache_stats
+from ..utils.logger import logging_pipeline
+from ..utils.metrics import registry
+
+db_pool_connections = registry.gauge(
+    'db_pool_connections',
+    'Database pool connections by state.',
+    ('engine', 'state')
+)
+db_pool_checkouts = registry.counter(
+    'db_pool_checkouts_total',
+    'Connections checked out of the database pool.',
+    ('engine',)
+)
+db_pool_timeouts = registry.counter(
+    'db_pool_timeouts_total',
+    'Checkouts that timed out waiting for a database connection.',
+    ('engine',)
+)
+db_pool_wait_seconds = registry.counter(
+    'db_pool_wait_seconds_total',
+    'Total time spent waiting for database connections.',
+    ('engine',)
+)
+db_pool_hold_seconds = registry.counter(
+    'db_pool_hold_seconds_total',
+    'Total time database connections were held before being returned.',
+    ('engine',)
+)
+db_pool_invalidations = registry.counter(
+    'db_pool_invalidations_total',
+    'Database connections invalidated by the pool.',
+    ('engine',)
+)
+db_circuit_state = registry.gauge(
+    'db_circuit_state',
+    'Current state of the primary database circuit breaker, 1 for the active state.',
+    ('state',)
+)
+
+cache_shared_operations = registry.counter(
+    'cache_shared_operations_total',
+    'Shared memory cache operations in this worker by result.',
+    ('result',)
+)
+
+cache_namespace_operations = registry.counter(
+    'cache_namespace_operations_total',
+    'Cached function calls by namespace and result.',
+    ('namespace', 'result')
+)
+cache_namespace_entries = registry.gauge(
+    'cache_namespace_entries',
+    'Entries held by each cache namespace.',
+    ('namespace',)
+)
+
+log_records_dropped = registry.counter(
+    'log_records_dropped_total',
+    'Log records dropped because the logging queue was full.'
+)
+
+
+def _collect_pool(name: str, engine: AsyncEngine) -> None:
+    pool = engine.pool
+
+    if not isinstance(pool, InstrumentedAsyncQueuePool):
+        return
+
+    db_pool_connections.set(pool.size(), (name, 'size'))
+    db_pool_connections.set(pool.checkedout(), (name, 'checked_out'))
+    db_pool_connections.set(pool.checkedin(), (name, 'checked_in'))
+    db_pool_connections.set(max(0, pool.overflow()), (name, 'overflow'))
+    db_pool_checkouts.set_total(pool.stats.checkouts, (name,))
+    db_pool_timeouts.set_total(pool.stats.timeouts, (name,))
+    db_pool_wait_seconds.set_total(pool.stats.wait_total_ns / 1_000_000_000, (name,))
+    db_pool_hold_seconds.set_total(pool.stats.hold_total_ns / 1_000_000_000, (name,))
+    db_pool_invalidations.set_total(pool.stats.invalidations, (name,))
+
+
+def _collect_pools() -> None:
+    _collect_pool('primary', get_engine())
+
+    for i, replica in enumerate(replica_router.replicas):
+        _collect_pool(f'replica_{i}', replica.engine)
+
+
+def _collect_circuit() -> None:
+    for state in (CLOSED, OPEN, HALF_OPEN):
+        db_circuit_state.set(int(db_circuit_breaker.state == state), (state,))
+
+
+def _collect_logging() -> None:
+    log_records_dropped.set_total(logging_pipeline.dropped)
+
+
+def _collect_cache() -> None:
+    cache_stats = get_cache_stats()
+
+    for result, value in (cache_stats['shared'] or {}).items():
+        cache_shared_operations.set_total(value, (result,))
+
+    for name, namespace_stats in cache_stats['namespaces'].items():
+        cache_namespace_entries.set(namespace_stats['entries'], (name,))
+
+        for result in ('hits', 'stale_hits', 'misses', 'coalesced', 'evictions', 'errors', 'bypasses'):
+            cache_namespace_operations.set_total(namespace_stats[result], (name, result))
+
+
+registry.add_collector(_collect_pools)
+registry.add_collector(_collect_circuit)
+registry.add_collector(_collect_logging)
+registry.add_collector(_collect_cache)
+
+
+@identity_required([UserType.ADMIN])
+async def export_metrics(
+    token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
+) -> str:
+    return registry.render()
+
+
+__all__ = ['export_metrics']
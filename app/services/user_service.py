@@ -26,6 +26,11 @@ from sqlalchemy import (
 
 from ..utils.errors import handle_db_errors
 from ..database import get_session
+from ..database.replicas import get_read_session
+from ..database.loaders import (
+    BatchLoader,
+    get_user_loader
+)
 from ..models.user import UserModel
 from ..schemas.request import QueryParams
 from ..schemas.response import (
@@ -91,6 +96,29 @@ async def __get_user_by_id(
     return db_user
 
 
+async def __load_user_by_id(
+    loader: BatchLoader[UUID, UserModel],
+    user_id: UUID | str,
+    is_deleted: bool | None
+) -> UserModel:
+    try:
+        db_user = await loader.load(UUID(str(user_id)))
+    except SQLAlchemyError as e:
+        err = await handle_db_errors(e)
+        raise HTTPException(
+            status_code=err.status_code,
+            detail=err.message
+        )
+
+    if db_user is None or (is_deleted is not None and db_user.is_deleted != is_deleted):
+        raise HTTPException(
+            status_code=HTTP_404_NOT_FOUND,
+            detail='Invalid user_id'
+        )
+
+    return db_user
+
+
 async def __update_user_by_id(
     session: Annotated[AsyncSession, Depends(get_session)],
     user_id: UUID,
@@ -182,7 +210,7 @@ async def create_user(
 async def fetch_all_users(
     request: Request,
     query_params: Annotated[QueryParams, Query()],
-    session: Annotated[AsyncSession, Depends(get_session)],
+    session: Annotated[AsyncSession, Depends(get_read_session)],
     token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
 ) -> ResponseModel:
     payload = token_returns[0]
@@ -223,6 +251,9 @@ async def fetch_all_users(
             errors=err.errors
         )
 
+    # serializing a page needs no database, so the connection goes back first
+    await session.close()
+
     db_users = [OutUser.model_validate({
         **user.to_dict(),
         'current_user_id': UUID(payload['id'])
@@ -240,14 +271,14 @@ async def fetch_all_users(
 @identity_required([UserType.ADMIN])
 async def fetch_user_by_id(
     query_params: Annotated[QueryParams, Query()],
-    session: Annotated[AsyncSession, Depends(get_session)],
+    loader: Annotated[BatchLoader[UUID, UserModel], Depends(get_user_loader)],
     token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)],
     user_id: UUID
 ) -> ResponseModel:
     payload = token_returns[0]
 
-    db_user = await __get_user_by_id(
-        session=session,
+    db_user = await __load_user_by_id(
+        loader=loader,
         user_id=user_id,
         is_deleted=query_params.is_deleted
     )
@@ -266,13 +297,13 @@ async def fetch_user_by_id(
 
 async def fetch_current_user(
     query_params: Annotated[QueryParams, Query()],
-    session: Annotated[AsyncSession, Depends(get_session)],
+    loader: Annotated[BatchLoader[UUID, UserModel], Depends(get_user_loader)],
     token_returns: Annotated[tuple[dict, dict], Depends(validate_access_token)]
 ) -> ResponseModel:
     payload = token_returns[0]
 
-    db_user = await __get_user_by_id(
-        session=session,
+    db_user = await __load_user_by_id(
+        loader=loader,
         user_id=payload['id'],
         is_deleted=query_params.is_deleted
     )
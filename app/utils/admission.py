@@ -0,0 +1,136 @@
+import math
+
+from ..configs import core_configs
+from ..database.core import get_engine
+from ..database.pool import InstrumentedAsyncQueuePool
+from .metrics import registry
+
+admission_requests_total = registry.counter(
+    'admission_requests_total',
+    'Requests seen by admission control by priority class and result.',
+    ('priority', 'result')
+)
+admission_in_flight = registry.gauge(
+    'admission_in_flight',
+    'Admitted requests currently being processed by priority class.',
+    ('priority',)
+)
+
+
+class AdmissionController:
+    """
+    Sheds requests before they queue for a database connection. Each
+    priority class may use a share of `max_in_flight` and of the pool wait
+    budget, so lower classes are shed first as load builds up while health
+    and auth keep being served. Requests mapped to a class without a share
+    are never counted or shed.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        pool_wait_budget: float,
+        shares: dict[str, float],
+        routes: dict[str, str]
+    ):
+        self.max_in_flight: int = max_in_flight
+        self.pool_wait_budget: float = pool_wait_budget
+        self.shares: dict[str, float] = shares
+        self.in_flight: int = 0
+        self.in_flight_by_class: dict[str, int] = {}
+        self._exact: dict[tuple[str, str], str] = {}
+        self._prefixes: list[tuple[str, str, str]] = []
+        self._routes: dict[str, str] = routes
+
+    def configure(self, api_prefix: str) -> None:
+        self._exact.clear()
+        self._prefixes.clear()
+
+        # keys are `[METHOD ]PATH`, where a PATH ending in * matches as a prefix
+        for route, priority in self._routes.items():
+            method, _, path = route.rpartition(' ')
+            method = method.upper() or '*'
+            path = f'{api_prefix}{path}'
+
+            if path.endswith('*'):
+                self._prefixes.append((method, path[:-1].rstrip('/'), priority))
+            else:
+                self._exact[(method, path.rstrip('/'))] = priority
+
+        self._prefixes.sort(key=lambda prefix: len(prefix[1]), reverse=True)
+
+    def classify(self, method: str, path: str) -> str:
+        path = path.rstrip('/')
+        priority = self._exact.get((method, path)) or self._exact.get(('*', path))
+
+        if priority is not None:
+            return priority
+
+        for prefix_method, prefix, prefix_priority in self._prefixes:
+            if prefix_method in ('*', method) and (path == prefix or path.startswith(f'{prefix}/')):
+                return prefix_priority
+
+        return 'normal'
+
+    @staticmethod
+    def pool_wait_estimate() -> float:
+        pool = get_engine().pool
+
+        if not isinstance(pool, InstrumentedAsyncQueuePool):
+            return 0.0
+
+        return pool.estimated_wait_ns() / 1_000_000_000
+
+    def try_admit(self, priority: str) -> float:
+        """
+        Admits the request and returns 0, or returns the seconds the client
+        should wait before retrying when it is shed.
+        """
+        share = self.shares.get(priority)
+
+        if share is None:
+            return 0.0
+
+        if self.in_flight >= self.max_in_flight * share:
+            admission_requests_total.inc((priority, 'shed_in_flight'))
+            return 1.0
+
+        pool_wait = self.pool_wait_estimate()
+
+        if pool_wait > self.pool_wait_budget * share:
+            admission_requests_total.inc((priority, 'shed_pool_wait'))
+            return max(1.0, math.ceil(pool_wait))
+
+        admission_requests_total.inc((priority, 'admitted'))
+        self.in_flight += 1
+        self.in_flight_by_class[priority] = self.in_flight_by_class.get(priority, 0) + 1
+        admission_in_flight.set(self.in_flight_by_class[priority], (priority,))
+        return 0.0
+
+    def release(self, priority: str) -> None:
+        if priority not in self.shares:
+            return
+
+        self.in_flight -= 1
+        self.in_flight_by_class[priority] -= 1
+        admission_in_flight.set(self.in_flight_by_class[priority], (priority,))
+
+    def to_dict(self) -> dict:
+        return {
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'pool_wait_ms': round(self.pool_wait_estimate() * 1000, 3),
+            'pool_wait_budget_ms': self.pool_wait_budget * 1000,
+            'in_flight_by_class': dict(self.in_flight_by_class)
+        }
+
+
+admission_controller = AdmissionController(
+    max_in_flight=core_configs.admission_max_in_flight,
+    pool_wait_budget=core_configs.admission_pool_wait_budget,
+    shares=core_configs.admission_classes,
+    routes=core_configs.admission_routes
+)
+
+
+__all__ = ['AdmissionController', 'admission_controller']
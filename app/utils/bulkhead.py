@@ -0,0 +1,122 @@
+import asyncio
+import logging
+
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from fastapi.exceptions import HTTPException
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+
+from ..configs import (
+    core_configs,
+    db_configs
+)
+from .metrics import registry
+
+logger = logging.getLogger(core_configs.logger_name)
+
+bulkhead_active = registry.gauge(
+    'bulkhead_active',
+    'Requests currently running inside each bulkhead.',
+    ('bulkhead',)
+)
+bulkhead_rejections_total = registry.counter(
+    'bulkhead_rejections_total',
+    'Requests rejected because their bulkhead was full.',
+    ('bulkhead',)
+)
+
+
+class Bulkhead:
+    def __init__(self, name: str, limit: int, max_wait: float):
+        self.name: str = name
+        self.limit: int = max(1, limit)
+        self.max_wait: float = max_wait
+        self.active: int = 0
+        self.rejections: int = 0
+        self._semaphore = asyncio.Semaphore(self.limit)
+
+    async def _acquire(self) -> bool:
+        if not self._semaphore.locked():
+            await self._semaphore.acquire()
+            return True
+
+        if self.max_wait <= 0:
+            return False
+
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            return False
+
+        return True
+
+    @asynccontextmanager
+    async def enter(self) -> AsyncGenerator[None, None]:
+        if not await self._acquire():
+            self.rejections += 1
+            bulkhead_rejections_total.inc((self.name,))
+            raise HTTPException(
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                detail='This part of the service is busy. Try again later.',
+                headers={'Retry-After': '1'}
+            )
+
+        self.active += 1
+        bulkhead_active.set(self.active, (self.name,))
+
+        try:
+            yield
+        finally:
+            self.active -= 1
+            bulkhead_active.set(self.active, (self.name,))
+            self._semaphore.release()
+
+    def to_dict(self) -> dict:
+        return {
+            'limit': self.limit,
+            'active': self.active,
+            'rejections': self.rejections
+        }
+
+
+def _build_bulkheads() -> tuple[dict[str, Bulkhead], dict[str, Bulkhead]]:
+    bulkheads: dict[str, Bulkhead] = {}
+    by_tag: dict[str, Bulkhead] = {}
+    # limits follow DB_POOL_SIZE and DB_POOL_MAX_OVERFLOW unless set explicitly
+    capacity = db_configs.pool_size + db_configs.pool_max_overflow
+
+    for name, options in core_configs.bulkheads.items():
+        limit = options.get('limit') or max(1, int(options.get('share', 1.0) * capacity))
+
+        if limit > capacity:
+            logger.warning('Bulkhead %s allows %d requests, more than the %d pool connections.', name, limit, capacity)
+
+        bulkhead = bulkheads[name] = Bulkhead(
+            name,
+            limit=limit,
+            max_wait=options.get('max_wait', core_configs.bulkhead_max_wait)
+        )
+
+        for tag in options.get('tags', []):
+            by_tag[tag] = bulkhead
+
+    return bulkheads, by_tag
+
+
+bulkheads, _bulkheads_by_tag = _build_bulkheads()
+
+
+def get_bulkhead(tags: list[str]) -> Bulkhead | None:
+    for tag in tags:
+        if tag in _bulkheads_by_tag:
+            return _bulkheads_by_tag[tag]
+
+    return None
+
+
+def get_bulkhead_stats() -> dict:
+    return {name: bulkhead.to_dict() for name, bulkhead in bulkheads.items()}
+
+
+__all__ = ['Bulkhead', 'bulkheads', 'get_bulkhead', 'get_bulkhead_stats']
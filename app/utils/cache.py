@@ -1,21 +1,273 @@
-from cachetools import TTLCache
-from typing import Any
+import asyncio
+import logging
 
-_cache = TTLCache(
-    maxsize=1024,
-    ttl=15
+from time import monotonic
+from functools import wraps
+from cachetools import (
+    LFUCache,
+    LRUCache
 )
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Hashable,
+    Literal,
+    ParamSpec,
+    TypeVar
+)
+
+from fastapi.exceptions import HTTPException
+from sqlalchemy.orm import Session as SyncSession
+from sqlalchemy.ext.asyncio.session import AsyncSession
+from starlette.requests import HTTPConnection
+
+from ..configs import core_configs
+from .shared_cache import SharedMemoryCache
+
+logger = logging.getLogger(core_configs.logger_name)
+
+P = ParamSpec('P')
+R = TypeVar('R')
+
+# created at import so that workers forked by app.server share one mapping
+_shared_cache: SharedMemoryCache | None = (
+    SharedMemoryCache(
+        slots=core_configs.cache_shared_slots,
+        slot_size=core_configs.cache_shared_slot_size
+    )
+    if core_configs.cache_backend == 'shared' else None
+)
+
+
+class CacheStats:
+    def __init__(self):
+        self.hits: int = 0
+        self.stale_hits: int = 0
+        self.misses: int = 0
+        self.coalesced: int = 0
+        self.evictions: int = 0
+        self.errors: int = 0
+        self.bypasses: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'errors': self.errors,
+            'bypasses': self.bypasses
+        }
+
+
+class _CacheEntry:
+    __slots__ = ('value', 'expires_at', 'stale_until')
+
+    def __init__(self, value: Any, expires_at: float, stale_until: float):
+        self.value = value
+        self.expires_at: float = expires_at
+        self.stale_until: float = stale_until
+
+
+class _CountingEvictions:
+    stats: CacheStats
+
+    def popitem(self):
+        item = super().popitem()
+        self.stats.evictions += 1
+        return item
+
+
+class _LRUStore(_CountingEvictions, LRUCache):
+    pass
+
+
+class _LFUStore(_CountingEvictions, LFUCache):
+    pass
+
+
+class CacheNamespace:
+    def __init__(
+        self,
+        name: str,
+        maxsize: int,
+        ttl: float,
+        policy: Literal['lru', 'lfu'] = 'lru',
+        stale_ttl: float = 0.0,
+        shared: bool = False
+    ):
+        self.name: str = name
+        self.ttl: float = ttl
+        self.stale_ttl: float = stale_ttl
+        self.policy: str = policy
+        # with CACHE_BACKEND=shared, loads are looked up in and written to
+        # the shared tier first, so one worker's load warms all the others
+        self.shared: SharedMemoryCache | None = _shared_cache if shared else None
+        self.stats = CacheStats()
+        self._store = (_LFUStore if policy == 'lfu' else _LRUStore)(maxsize=maxsize)
+        self._store.stats = self.stats
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        shared_key = f'{self.name}:{key!r}'
+        value = self.shared.get(shared_key) if self.shared is not None else None
+
+        if value is None:
+            try:
+                value = await loader()
+            except HTTPException:
+                # an expected outcome such as a rejected token, not a failure
+                raise
+            except Exception as e:
+                # keys are left out since they can be credentials such as bearer tokens
+                self.stats.errors += 1
+                logger.error('Loading into cache %s failed: %s', self.name, e)
+                raise
+
+            if self.shared is not None:
+                self.shared.set(shared_key, value, self.ttl)
+
+        now = monotonic()
+        self._store[key] = _CacheEntry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+        return value
+
+    def _on_loaded(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+        # background refreshes have no awaiter, so mark their errors as seen
+        if not task.cancelled():
+            task.exception()
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        # concurrent callers share one load per key instead of stampeding
+        task = self._inflight.get(key)
+
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._load(key, loader))
+            task.add_done_callback(lambda done: self._on_loaded(key, done))
+            self._inflight[key] = task
+
+        return task
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        entry: _CacheEntry | None = self._store.get(key)
+        now = monotonic()
+
+        if entry is not None:
+            if now < entry.expires_at:
+                self.stats.hits += 1
+                return entry.value
+
+            if now < entry.stale_until:
+                self.stats.stale_hits += 1
+                self._refresh(key, loader)
+                return entry.value
+
+        self.stats.misses += 1
+        self.stats.coalesced += int(key in self._inflight)
+        # shielded so a cancelled caller does not cancel the shared load
+        return await asyncio.shield(self._refresh(key, loader))
+
+    def invalidate(self, key: Hashable) -> None:
+        self._store.pop(key, None)
+
+    def clear(self) -> None:
+        self._store.clear()
+
+    def to_dict(self) -> dict:
+        return {
+            'policy': self.policy,
+            'maxsize': self._store.maxsize,
+            'ttl': self.ttl,
+            'stale_ttl': self.stale_ttl,
+            'shared': self.shared is not None,
+            'entries': len(self._store),
+            'in_flight': len(self._inflight),
+            **self.stats.to_dict()
+        }
+
+
+_namespaces: dict[str, CacheNamespace] = {}
+
+
+def get_namespace(
+    name: str,
+    maxsize: int = 1024,
+    ttl: float = 60.0,
+    policy: Literal['lru', 'lfu'] = 'lru',
+    stale_ttl: float = 0.0,
+    shared: bool = False
+) -> CacheNamespace:
+    if name not in _namespaces:
+        # CACHE_NAMESPACES overrides the sizes chosen in code per deployment
+        options = {
+            'maxsize': maxsize,
+            'ttl': ttl,
+            'policy': policy,
+            'stale_ttl': stale_ttl,
+            'shared': shared,
+            **core_configs.cache_namespaces.get(name, {})
+        }
+        _namespaces[name] = CacheNamespace(name, **options)
+
+    return _namespaces[name]
+
+
+# these hash by identity, so every call would store a new entry that keeps
+# the request or session alive until it is evicted
+_UNCACHEABLE_TYPES: tuple[type, ...] = (HTTPConnection, AsyncSession, SyncSession)
+
+
+def _make_key(args: tuple, kwargs: dict) -> Hashable:
+    if any(isinstance(value, _UNCACHEABLE_TYPES) for value in (*args, *kwargs.values())):
+        raise TypeError('Requests and sessions cannot be part of a cache key.')
+
+    return args + tuple(sorted(kwargs.items())) if kwargs else args
+
+
+def cached(
+    namespace: str,
+    maxsize: int = 1024,
+    ttl: float = 60.0,
+    policy: Literal['lru', 'lfu'] = 'lru',
+    stale_ttl: float = 0.0,
+    shared: bool = False,
+    key: Callable[..., Hashable] | None = None
+) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+    cache_namespace = get_namespace(namespace, maxsize, ttl, policy, stale_ttl, shared)
 
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            try:
+                cache_key = key(*args, **kwargs) if key is not None else _make_key(args, kwargs)
+                hash(cache_key)
+            except TypeError:
+                # arguments such as sessions or requests cannot be cache keys
+                cache_namespace.stats.bypasses += 1
+                return await func(*args, **kwargs)
 
-def set_cache(key: str, value: Any) -> None:
-    _cache[key] = value
+            return await cache_namespace.get_or_load(cache_key, lambda: func(*args, **kwargs))
 
+        wrapper.cache = cache_namespace
+        return wrapper
+    return decorator
 
-def read_cache(key: str) -> Any:
-    if key not in _cache:
-        return None
 
-    return _cache[key]
+def get_cache_stats() -> dict:
+    return {
+        'backend': core_configs.cache_backend,
+        'shared': _shared_cache.stats.to_dict() if _shared_cache is not None else None,
+        'namespaces': {name: namespace.to_dict() for name, namespace in _namespaces.items()}
+    }
 
 
-__all__ = ['set_cache', 'read_cache']
+__all__ = [
+    'cached',
+    'get_namespace',
+    'CacheNamespace',
+    'get_cache_stats'
+]
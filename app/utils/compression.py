@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import zlib
+
+from cachetools import LRUCache
+from typing import (
+    Callable,
+    Protocol
+)
+
+from ..configs import core_configs
+from .metrics import registry
+
+# brotli and zstd are optional, the encodings are offered when installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+http_response_compression_bytes_total = registry.counter(
+    'http_response_compression_bytes_total',
+    'Response bytes before and after compression by encoding.',
+    ('encoding', 'stage')
+)
+http_response_compression_cache_total = registry.counter(
+    'http_response_compression_cache_total',
+    'Lookups of previously compressed bodies by result.',
+    ('result',)
+)
+
+
+class StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class _GzipStream:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        # a sync flush lets the client decode each chunk as soon as it arrives
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int):
+        if zstd is not None:
+            self._compressor = zstd.ZstdCompressor(level=level)
+            self._flush_block = zstd.ZstdCompressor.FLUSH_BLOCK
+        else:
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+
+    def compress(self, data: bytes) -> bytes:
+        if zstd is not None:
+            return self._compressor.compress(data, mode=self._flush_block)
+
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _compress_zstd(data: bytes, level: int) -> bytes:
+    if zstd is not None:
+        return zstd.compress(data, level=level)
+
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+class Encoding:
+    def __init__(
+        self,
+        name: str,
+        compress: Callable[[bytes], bytes],
+        stream: Callable[[], StreamCompressor]
+    ):
+        self.name: str = name
+        self.compress: Callable[[bytes], bytes] = compress
+        self.stream: Callable[[], StreamCompressor] = stream
+
+
+def _available_encodings() -> dict[str, Encoding]:
+    gzip_level = core_configs.compression_gzip_level
+    brotli_quality = core_configs.compression_brotli_quality
+    zstd_level = core_configs.compression_zstd_level
+
+    encodings = {
+        'gzip': Encoding(
+            'gzip',
+            lambda data: zlib.compress(data, gzip_level, wbits=31),
+            lambda: _GzipStream(gzip_level)
+        )
+    }
+
+    if brotli is not None:
+        encodings['br'] = Encoding(
+            'br',
+            lambda data: brotli.compress(data, quality=brotli_quality),
+            lambda: _BrotliStream(brotli_quality)
+        )
+
+    if zstd is not None or zstandard is not None:
+        encodings['zstd'] = Encoding(
+            'zstd',
+            lambda data: _compress_zstd(data, zstd_level),
+            lambda: _ZstdStream(zstd_level)
+        )
+
+    # in the configured order of preference, which breaks ties between equal q-values
+    return {name: encodings[name] for name in core_configs.compression_encodings if name in encodings}
+
+
+encodings: dict[str, Encoding] = _available_encodings()
+
+
+def negotiate_encoding(accept_encoding: str) -> Encoding | None:
+    accepted: dict[str, float] = {}
+
+    for part in accept_encoding.lower().split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+
+            if key == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if name:
+            accepted[name.strip()] = quality
+
+    best: Encoding | None = None
+    best_quality = 0.0
+
+    for name, encoding in encodings.items():
+        quality = accepted.get(name, accepted.get('*', 0.0))
+
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
+
+
+class CompressedBodyCache:
+    """
+    Compressed bodies keyed by encoding and a digest of the uncompressed
+    body, bounded by the total size of the compressed bytes. Identical
+    bodies, such as the OpenAPI schema or payloads served from a cache, are
+    compressed once. Most API responses carry a timestamp and never repeat,
+    so a body is only stored the second time its digest is seen; until then
+    only the digest is remembered. Hashing a body costs a small fraction of
+    compressing it.
+    """
+
+    def __init__(self, max_bytes: int, max_body_size: int, max_seen: int = 4096):
+        self.max_body_size: int = max_body_size
+        self._cache: LRUCache | None = LRUCache(maxsize=max_bytes, getsizeof=len) if max_bytes > 0 else None
+        self._seen: LRUCache = LRUCache(maxsize=max_seen)
+
+    def _key(self, encoding: Encoding, body: bytes) -> tuple[str, bytes] | None:
+        if self._cache is None or len(body) > self.max_body_size:
+            return None
+
+        return encoding.name, hashlib.blake2b(body, digest_size=16).digest()
+
+    async def compress(self, encoding: Encoding, body: bytes) -> bytes:
+        key = self._key(encoding, body)
+
+        if key is not None:
+            compressed = self._cache.get(key)
+
+            if compressed is not None:
+                http_response_compression_cache_total.inc(('hit',))
+                return compressed
+
+            http_response_compression_cache_total.inc(('miss',))
+
+        compressed = await compress_body(encoding, body)
+
+        if key is None or len(compressed) > self._cache.maxsize:
+            return compressed
+
+        if self._seen.pop(key, None) is None:
+            self._seen[key] = True
+        else:
+            self._cache[key] = compressed
+
+        return compressed
+
+
+async def compress_body(encoding: Encoding, body: bytes) -> bytes:
+    # zlib, brotli and zstd release the GIL, so large bodies are compressed
+    # on the default executor instead of blocking the event loop
+    if len(body) >= core_configs.compression_offload_size:
+        compressed = await asyncio.get_running_loop().run_in_executor(None, encoding.compress, body)
+    else:
+        compressed = encoding.compress(body)
+
+    http_response_compression_bytes_total.inc((encoding.name, 'in'), len(body))
+    http_response_compression_bytes_total.inc((encoding.name, 'out'), len(compressed))
+    return compressed
+
+
+async def compress_chunk(stream: StreamCompressor, encoding: Encoding, chunk: bytes) -> bytes:
+    if len(chunk) >= core_configs.compression_offload_size:
+        compressed = await asyncio.get_running_loop().run_in_executor(None, stream.compress, chunk)
+    else:
+        compressed = stream.compress(chunk)
+
+    http_response_compression_bytes_total.inc((encoding.name, 'in'), len(chunk))
+    http_response_compression_bytes_total.inc((encoding.name, 'out'), len(compressed))
+    return compressed
+
+
+compressed_body_cache = CompressedBodyCache(
+    max_bytes=core_configs.compression_cache_bytes,
+    max_body_size=core_configs.compression_cache_max_body_size
+)
+
+
+__all__ = [
+    'Encoding',
+    'StreamCompressor',
+    'encodings',
+    'negotiate_encoding',
+    'compress_body',
+    'compress_chunk',
+    'compressed_body_cache'
+]
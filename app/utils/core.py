@@ -1,23 +1,13 @@
 import logging
+import math
 import re
 import unicodedata
 
-from fastapi import Depends
 from pydantic import BaseModel
 from time import perf_counter_ns
-from typing import Annotated
 from fastapi.requests import Request
 from fastapi.encoders import jsonable_encoder
-from sqlalchemy.ext.asyncio.session import AsyncSession
-from sqlalchemy import text
 
-from psutil import (
-    cpu_percent,
-    virtual_memory
-)
-
-from ..database import get_session
-from .cache import read_cache
 from ..configs import core_configs
 
 logger = logging.getLogger(core_configs.logger_name)
@@ -39,28 +29,19 @@ async def get_api_uptime(request: Request) -> str:
     return formatted_time
 
 
-async def get_system_metrics() -> dict:
+def get_system_metrics() -> dict:
+    # only the background health prober needs psutil
+    from psutil import (
+        cpu_percent,
+        virtual_memory
+    )
+
     return {
         'cpu_usage': f'{cpu_percent()}%',
         'memory_usage': f'{virtual_memory().percent}%'
     }
 
 
-async def get_db_response_time_ms(
-    request: Request,
-    session: Annotated[AsyncSession, Depends(get_session)],
-):
-    r = await session.execute(text('SELECT 1'))
-    r.one_or_none()
-    duration_ns = read_cache(request.state.request_id)
-
-    if duration_ns is not None:
-        duration_ms: float = duration_ns / 1_000_000
-        return f'{duration_ms:.2} ms'
-
-    return duration_ns
-
-
 def json_encode_response_model(response: BaseModel) -> dict:
     return jsonable_encoder(
         obj=response,
@@ -68,6 +49,10 @@ def json_encode_response_model(response: BaseModel) -> dict:
     )
 
 
+def format_retry_after(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
+
+
 def clean_text(text: str) -> str:
     return ' '.join((
         unicodedata
@@ -1,21 +1,47 @@
+from fastapi.exceptions import HTTPException
 from starlette.status import (
     HTTP_400_BAD_REQUEST,
     HTTP_422_UNPROCESSABLE_ENTITY,
     HTTP_409_CONFLICT,
-    HTTP_500_INTERNAL_SERVER_ERROR
+    HTTP_500_INTERNAL_SERVER_ERROR,
+    HTTP_503_SERVICE_UNAVAILABLE
 )
 
 from sqlalchemy.exc import (
     DataError,
     IntegrityError,
     OperationalError,
-    SQLAlchemyError
+    SQLAlchemyError,
+    TimeoutError as PoolTimeoutError
 )
 
+from ..database.circuit import DatabaseUnavailableError
 from ..schemas.common import DetailedError
+from .core import format_retry_after
 
 
 async def handle_db_errors(e: SQLAlchemyError) -> DetailedError:
+    """
+    Returns the error to report for a failed query. When no connection
+    could be had, because the pool is exhausted or the database is
+    unreachable, it raises an HTTPException 503 with Retry-After instead:
+    that is an overload, not a failed query, so the client is told to back
+    off rather than getting an error payload.
+    """
+    if isinstance(e, PoolTimeoutError):
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail='The database is busy. Try again later.',
+            headers={'Retry-After': '1'}
+        )
+
+    if isinstance(e, DatabaseUnavailableError):
+        raise HTTPException(
+            status_code=HTTP_503_SERVICE_UNAVAILABLE,
+            detail='The database is unavailable. Try again later.',
+            headers={'Retry-After': format_retry_after(e.retry_after)}
+        )
+
     if isinstance(e, DataError):
         return DetailedError(
             status_code=HTTP_422_UNPROCESSABLE_ENTITY,
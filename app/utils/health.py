@@ -0,0 +1,175 @@
+import asyncio
+import logging
+
+from time import (
+    monotonic,
+    perf_counter_ns
+)
+from datetime import (
+    datetime,
+    timezone
+)
+
+from sqlalchemy import text
+
+from ..configs import core_configs
+from ..database.circuit import db_circuit_breaker
+from ..database.core import get_engine
+from ..database.pool import get_pool_stats
+from ..database.replicas import replica_router
+from ..database.loaders import (
+    user_loader,
+    replica_user_loader
+)
+from .core import get_system_metrics
+from .admission import admission_controller
+from .bulkhead import get_bulkhead_stats
+from .warmup import warmup
+
+logger = logging.getLogger(core_configs.logger_name)
+
+
+async def probe_database(timeout: float) -> dict:
+    start_time_ns = perf_counter_ns()
+
+    async def ping() -> None:
+        async with get_engine().connect() as conn:
+            await conn.execute(text('SELECT 1'))
+
+    try:
+        await asyncio.wait_for(ping(), timeout=timeout)
+    except Exception as e:
+        return {
+            'status': 'unhealthy',
+            'error': str(e) or type(e).__name__
+        }
+
+    duration_ms: float = (perf_counter_ns() - start_time_ns) / 1_000_000
+
+    return {
+        'status': 'healthy',
+        'response_time_ms': f'{duration_ms:.2f} ms'
+    }
+
+
+async def probe_replicas(timeout: float, only_due: bool = False) -> list[dict]:
+    await asyncio.gather(*(
+        asyncio.wait_for(replica.refresh_lag(), timeout=timeout)
+        for replica in replica_router.replicas
+        if not only_due or replica.is_due
+    ), return_exceptions=True)
+
+    return replica_router.stats()
+
+
+async def probe_system(timeout: float) -> dict:
+    try:
+        return await asyncio.wait_for(asyncio.to_thread(get_system_metrics), timeout=timeout)
+    except Exception as e:
+        return {'error': str(e) or type(e).__name__}
+
+
+def collect_database_state() -> dict:
+    return {
+        'pool': get_pool_stats(get_engine().pool),
+        'circuit_breaker': db_circuit_breaker.to_dict(),
+        'batch_loaders': {
+            'users_by_id': user_loader.stats.to_dict(),
+            'replica_users_by_id': replica_user_loader.stats.to_dict()
+        },
+        'replicas': replica_router.stats()
+    }
+
+
+class HealthProber:
+    def __init__(self, interval: float, timeout: float):
+        self.interval: float = interval
+        self.timeout: float = timeout
+        self.snapshot: dict | None = None
+        self.sampled_at: float | None = None
+        self._task: asyncio.Task | None = None
+
+    async def sample(self) -> dict:
+        # replica lag is only refreshed here, so routing reads never waits for it
+        database, _, system_metrics = await asyncio.gather(
+            probe_database(self.timeout),
+            probe_replicas(self.timeout, only_due=True),
+            probe_system(self.timeout)
+        )
+
+        self.snapshot = {
+            'sampled_at': datetime.now(timezone.utc).isoformat(),
+            'system_metrics': system_metrics,
+            'admission': admission_controller.to_dict(),
+            'bulkheads': get_bulkhead_stats(),
+            'database': {
+                **database,
+                **collect_database_state()
+            }
+        }
+        self.sampled_at = monotonic()
+        return self.snapshot
+
+    async def deep_check(self) -> dict:
+        database, replicas, system_metrics = await asyncio.gather(
+            probe_database(self.timeout),
+            probe_replicas(self.timeout),
+            probe_system(self.timeout)
+        )
+
+        return {
+            'sampled_at': datetime.now(timezone.utc).isoformat(),
+            'system_metrics': system_metrics,
+            'database': {
+                **database,
+                **collect_database_state(),
+                'replicas': replicas
+            }
+        }
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.sampled_at is not None and monotonic() - self.sampled_at <= self.interval * 3
+
+    @property
+    def is_ready(self) -> bool:
+        return (
+            warmup.is_complete
+            and self.is_fresh
+            and self.snapshot['database']['status'] == 'healthy'
+        )
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.error('Health probe failed: %s', e)
+
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+
+health_prober = HealthProber(
+    interval=core_configs.health_probe_interval,
+    timeout=core_configs.health_probe_timeout
+)
+
+
+__all__ = ['HealthProber', 'health_prober', 'collect_database_state']
@@ -0,0 +1,61 @@
+from bisect import bisect_left
+from typing import Final
+
+DEFAULT_LATENCY_BUCKETS_MS: Final[tuple[float, ...]] = (
+    1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+
+class Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets: tuple[float, ...] = buckets
+        # the last slot counts observations above the largest bucket
+        self.counts: list[int] = [0] * (len(buckets) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        result = []
+
+        for bound, count in zip((*self.buckets, float('inf')), self.counts):
+            total += count
+            result.append((bound, total))
+
+        return result
+
+    def percentile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+
+        rank = q * self.count
+
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound if bound != float('inf') else self.buckets[-1]
+
+        return self.buckets[-1]
+
+    def to_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 4),
+            'avg': round(self.sum / self.count, 4) if self.count else None,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': {
+                ('+Inf' if bound == float('inf') else str(bound)): total
+                for bound, total in self.cumulative()
+            }
+        }
+
+
+__all__ = ['DEFAULT_LATENCY_BUCKETS_MS', 'Histogram']
@@ -3,13 +3,39 @@ from contextlib import asynccontextmanager
 from time import perf_counter_ns
 
 from ..database import events
+from ..database.core import (
+    get_engine,
+    dispose_engine
+)
+from ..database.replicas import replica_router
+from ..configs import core_configs
+from .logger import logging_pipeline
+from .loop_monitor import loop_monitor
+from .health import health_prober
+from .warmup import warmup
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     start_time_ns: int = perf_counter_ns()
     app.state.start_time_ns = start_time_ns
+    logging_pipeline.start()
+
+    if core_configs.loop_monitor_enabled:
+        loop_monitor.start()
+
+    # each worker builds its own engine and pool after it has been forked
+    get_engine()
+    health_prober.start()
+    warmup.start(app)
 
     yield
 
+    await warmup.stop()
+    await health_prober.stop()
+    await loop_monitor.stop()
+    # in-flight requests have finished by now, so the pools can be drained
+    await dispose_engine()
+    await replica_router.dispose()
+    logging_pipeline.stop()
     del app.state.start_time_ns
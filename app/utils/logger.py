@@ -0,0 +1,187 @@
+import json
+import logging
+import queue
+import random
+import sys
+
+from datetime import (
+    datetime,
+    timezone
+)
+
+from logging.handlers import (
+    QueueHandler,
+    QueueListener
+)
+
+from ..configs import core_configs
+from .request import (
+    get_request_id,
+    get_route_path
+)
+
+_RECORD_ATTRIBUTES: frozenset[str] = frozenset(
+    logging.LogRecord('', 0, '', 0, '', None, None).__dict__
+) | {'message', 'asctime', 'request_id', 'route', 'color_message'}
+
+
+class RequestContextFilter(logging.Filter):
+    # contextvars are only visible on the thread that emitted the record, so
+    # request details are attached before the record is queued
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = get_request_id()
+        record.route = get_route_path()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    def __init__(self, sample_rates: dict[str, float]):
+        super().__init__()
+        self._sample_rates: dict[str, float] = sample_rates
+        self._resolved: dict[str, float] = {}
+
+    def _sample_rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+
+        if rate is None:
+            parts = name.split('.')
+            rate = 1.0
+
+            # the most specific configured parent logger wins
+            for i in range(len(parts), 0, -1):
+                parent = '.'.join(parts[:i])
+
+                if parent in self._sample_rates:
+                    rate = self._sample_rates[parent]
+                    break
+
+            self._resolved[name] = rate
+
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+
+        rate = self._sample_rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'route': getattr(record, 'route', None)
+        }
+
+        payload.update({
+            key: value
+            for key, value in record.__dict__.items()
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_')
+        })
+
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload['exception'] = record.exc_text
+
+        return json.dumps(payload, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # formatting happens on the listener thread; the arguments are kept
+        # because formatters such as uvicorn's access formatter unpack them
+        record = logging.makeLogRecord(record.__dict__)
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    def __init__(self):
+        self.handlers: list[NonBlockingQueueHandler] = []
+        self._listeners: list[QueueListener] = []
+        self._replaced: dict[str, tuple[list[logging.Handler], bool]] = {}
+
+    def start(self) -> None:
+        if self._listeners:
+            return
+
+        sampling_filter = SamplingFilter(core_configs.log_sample_rates)
+        context_filter = RequestContextFilter()
+        json_handler: logging.Handler | None = None
+
+        if core_configs.log_format == 'json':
+            json_handler = logging.StreamHandler(sys.stdout)
+            json_handler.setFormatter(JsonFormatter())
+
+        for name in core_configs.log_queue_loggers:
+            logger = logging.getLogger(name)
+            # in text mode each logger keeps the handlers the server configured
+            targets = [json_handler] if json_handler is not None else list(logger.handlers)
+
+            if not targets:
+                continue
+
+            log_queue: queue.Queue = queue.Queue(maxsize=core_configs.log_queue_size)
+            handler = NonBlockingQueueHandler(log_queue)
+            handler.addFilter(sampling_filter)
+            handler.addFilter(context_filter)
+
+            self._replaced[name] = (list(logger.handlers), logger.propagate)
+            logger.handlers = [handler]
+            logger.propagate = False
+
+            listener = QueueListener(log_queue, *targets, respect_handler_level=True)
+            listener.start()
+
+            self.handlers.append(handler)
+            self._listeners.append(listener)
+
+    def stop(self) -> None:
+        for name, (handlers, propagate) in self._replaced.items():
+            logger = logging.getLogger(name)
+            logger.handlers = handlers
+            logger.propagate = propagate
+
+        # stopping a listener flushes the records still in its queue
+        for listener in self._listeners:
+            listener.stop()
+
+        self.handlers.clear()
+        self._listeners.clear()
+        self._replaced.clear()
+
+    @property
+    def dropped(self) -> int:
+        return sum(handler.dropped for handler in self.handlers)
+
+
+logging_pipeline = LoggingPipeline()
+
+
+__all__ = [
+    'JsonFormatter',
+    'SamplingFilter',
+    'RequestContextFilter',
+    'NonBlockingQueueHandler',
+    'logging_pipeline'
+]
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+
+from time import (
+    perf_counter,
+    time
+)
+from types import FrameType
+
+from ..configs import core_configs
+from .metrics import registry
+from .request import get_route_path
+
+logger = logging.getLogger(core_configs.logger_name)
+
+_app_dir: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+event_loop_lag_seconds = registry.histogram(
+    'event_loop_lag_seconds',
+    'Delay between when the loop monitor was due to run and when it ran.',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+event_loop_stalls_total = registry.counter(
+    'event_loop_stalls_total',
+    'Event loop stalls above the threshold by the route that was running.',
+    ('route',)
+)
+
+
+def _format_frame(frame: FrameType) -> str:
+    filename = frame.f_code.co_filename
+
+    if filename.startswith(_app_dir):
+        filename = os.path.relpath(filename, os.path.dirname(_app_dir))
+
+    return f'{filename}:{frame.f_lineno} in {frame.f_code.co_name}'
+
+
+class StallSite:
+    def __init__(self, site: str):
+        self.site: str = site
+        self.count: int = 0
+        self.total_s: float = 0.0
+        self.max_s: float = 0.0
+        self.last_seen_at: float = 0.0
+        self.last_request_id: str | None = None
+        self.last_route: str | None = None
+        self.stack: list[str] = []
+
+    def to_dict(self) -> dict:
+        return {
+            'site': self.site,
+            'count': self.count,
+            'total_ms': round(self.total_s * 1000, 3),
+            'max_ms': round(self.max_s * 1000, 3),
+            'last_seen_at': self.last_seen_at,
+            'last_request_id': self.last_request_id,
+            'last_route': self.last_route,
+            'stack': self.stack
+        }
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag with a task that sleeps for `interval` and
+    records how late it wakes up. A watchdog thread notices when that task
+    has not run for longer than `interval + threshold` and captures the stack
+    of the loop thread while it is still blocked. The stack is attributed to
+    the request whose middleware frame is on it, then grouped by call site.
+    """
+
+    def __init__(self, interval: float, threshold: float, max_sites: int, stack_depth: int = 32):
+        self.interval: float = interval
+        self.threshold: float = threshold
+        self.max_sites: int = max_sites
+        self.stack_depth: int = stack_depth
+        self.last_lag_s: float = 0.0
+        self.stalls: int = 0
+        self.sites: dict[str, StallSite] = {}
+        self._heartbeat: float = 0.0
+        self._captured_for: float | None = None
+        self._pending: tuple[str, list[str], str | None, str | None] | None = None
+        self._thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    @staticmethod
+    def _find_request(frame: FrameType | None) -> tuple[str | None, str | None]:
+        # the request middleware keeps the request id and scope as locals
+        # for as long as the request runs, so they can be read off its frame
+        from ..middlewares.request_middlewares import AddRequestIdMiddleware
+
+        middleware_code = AddRequestIdMiddleware.__call__.__code__
+
+        while frame is not None:
+            if frame.f_code is middleware_code:
+                local_vars = frame.f_locals
+                return local_vars.get('request_id'), get_route_path(local_vars.get('scope'))
+
+            frame = frame.f_back
+
+        return None, None
+
+    def _capture(self, frame: FrameType) -> tuple[str, list[str], str | None, str | None]:
+        stack = []
+        site = None
+        current = frame
+
+        while current is not None and len(stack) < self.stack_depth:
+            formatted = _format_frame(current)
+            stack.append(formatted)
+
+            # the innermost frame of the app itself shows who made the blocking call
+            if site is None and current.f_code.co_filename.startswith(_app_dir):
+                site = formatted if current is frame else f'{stack[0]} <- {formatted}'
+
+            current = current.f_back
+
+        request_id, route = self._find_request(frame)
+        return site or stack[0], stack, request_id, route
+
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.threshold / 2):
+            heartbeat = self._heartbeat
+
+            if perf_counter() - heartbeat < self.interval + self.threshold or self._captured_for == heartbeat:
+                continue
+
+            frame = sys._current_frames().get(self._thread_id)
+
+            if frame is not None:
+                self._pending = self._capture(frame)
+                self._captured_for = heartbeat
+
+            del frame
+
+    def _record_stall(self, lag_s: float) -> None:
+        pending, self._pending = self._pending, None
+        # stalls shorter than the watchdog period can end before it looks
+        site, stack, request_id, route = pending or ('<not captured>', [], None, None)
+
+        self.stalls += 1
+        event_loop_stalls_total.inc((route or 'none',))
+        stall_site = self.sites.get(site)
+
+        if stall_site is None:
+            if len(self.sites) >= self.max_sites:
+                del self.sites[min(self.sites, key=lambda key: self.sites[key].total_s)]
+
+            stall_site = self.sites[site] = StallSite(site)
+
+        stall_site.count += 1
+        stall_site.total_s += lag_s
+        stall_site.max_s = max(stall_site.max_s, lag_s)
+        stall_site.last_seen_at = time()
+        stall_site.last_request_id = request_id
+        stall_site.last_route = route
+        stall_site.stack = stack or stall_site.stack
+
+        logger.warning(
+            'Event loop blocked for %.1f ms at %s (request %s, route %s)',
+            lag_s * 1000, site, request_id, route
+        )
+
+    async def _run(self) -> None:
+        while True:
+            self._heartbeat = perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_s = max(0.0, perf_counter() - self._heartbeat - self.interval)
+            self.last_lag_s = lag_s
+            event_loop_lag_seconds.observe(lag_s)
+
+            if lag_s >= self.threshold:
+                self._record_stall(lag_s)
+
+    def top(self, limit: int = 20) -> dict:
+        histogram = event_loop_lag_seconds.get()
+
+        return {
+            'threshold_ms': self.threshold * 1000,
+            'last_lag_ms': round(self.last_lag_s * 1000, 3),
+            'samples': histogram.count if histogram is not None else 0,
+            'stalls': self.stalls,
+            'sites': [
+                site.to_dict()
+                for site in sorted(self.sites.values(), key=lambda site: site.total_s, reverse=True)[:limit]
+            ]
+        }
+
+    def reset(self) -> None:
+        self.stalls = 0
+        self.sites.clear()
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+
+        self._thread_id = threading.get_ident()
+        self._heartbeat = perf_counter()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        self._watchdog = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._stopping.set()
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._watchdog.join()
+        self._task = None
+        self._watchdog = None
+
+
+loop_monitor = LoopMonitor(
+    interval=core_configs.loop_monitor_interval,
+    threshold=core_configs.loop_stall_threshold,
+    max_sites=core_configs.loop_stall_max_sites
+)
+
+
+__all__ = ['LoopMonitor', 'loop_monitor']
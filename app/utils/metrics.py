@@ -0,0 +1,200 @@
+from typing import (
+    Callable,
+    Final
+)
+
+from .histogram import Histogram
+
+DEFAULT_LATENCY_BUCKETS_SECONDS: Final[tuple[float, ...]] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str | None = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+
+    if extra is not None:
+        pairs.append(extra)
+
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    type_: str = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = labelnames
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        return '\n'.join([
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} {self.type_}',
+            *self.samples()
+        ])
+
+
+class Counter(Metric):
+    type_ = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set_total(self, value: float, labels: tuple = ()) -> None:
+        # for totals that are kept elsewhere and copied in by a collector
+        self._values[labels] = value
+
+    def samples(self) -> list[str]:
+        return [
+            f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Counter):
+    type_ = 'gauge'
+
+    def set(self, value: float, labels: tuple = ()) -> None:
+        self._values[labels] = value
+
+    def dec(self, labels: tuple = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class HistogramMetric(Metric):
+    type_ = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_SECONDS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple[float, ...] = buckets
+        self._histograms: dict[tuple, Histogram] = {}
+
+    def observe(self, value: float, labels: tuple = ()) -> None:
+        histogram = self._histograms.get(labels)
+
+        if histogram is None:
+            histogram = self._histograms[labels] = Histogram(self.buckets)
+
+        histogram.observe(value)
+
+    def get(self, labels: tuple = ()) -> Histogram | None:
+        return self._histograms.get(labels)
+
+    def samples(self) -> list[str]:
+        lines = []
+
+        for labels, histogram in self._histograms.items():
+            for bound, total in histogram.cumulative():
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {total}')
+
+            lines.append(f'{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(histogram.sum)}')
+            lines.append(f'{self.name}_count{_format_labels(self.labelnames, labels)} {histogram.count}')
+
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered.')
+
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS_SECONDS
+    ) -> HistogramMetric:
+        return self.register(HistogramMetric(name, documentation, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        # collectors refresh gauges that are cheaper to read at scrape time
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+
+        return '\n'.join(metric.render() for metric in self._metrics.values()) + '\n'
+
+
+registry = MetricsRegistry()
+
+http_requests_total = registry.counter(
+    'http_requests_total',
+    'Total HTTP requests by route, method and status.',
+    ('route', 'method', 'status')
+)
+http_request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds',
+    'HTTP request latency by route, method and status.',
+    ('route', 'method', 'status')
+)
+http_requests_in_flight = registry.gauge(
+    'http_requests_in_flight',
+    'HTTP requests currently being processed.'
+)
+password_hash_duration_seconds = registry.histogram(
+    'password_hash_duration_seconds',
+    'Time spent hashing or verifying passwords on the hashing executor.',
+    ('operation',),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+)
+password_hash_queue_seconds = registry.histogram(
+    'password_hash_queue_seconds',
+    'Time password hashing jobs waited for a hashing executor thread.',
+    ('operation',)
+)
+
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'HistogramMetric',
+    'MetricsRegistry',
+    'registry',
+    'http_requests_total',
+    'http_request_duration_seconds',
+    'http_requests_in_flight',
+    'password_hash_duration_seconds',
+    'password_hash_queue_seconds'
+]
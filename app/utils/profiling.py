@@ -0,0 +1,223 @@
+import sys
+
+from time import (
+    perf_counter_ns,
+    time
+)
+from types import (
+    CodeType,
+    FrameType
+)
+from collections import OrderedDict
+from typing import (
+    Any,
+    Coroutine,
+    Generator
+)
+
+from ..configs import core_configs
+
+AWAIT_FRAME: str = '<await>'
+
+
+def _code_name(code: CodeType, module: str | None) -> str:
+    return f'{module or "?"}:{getattr(code, "co_qualname", code.co_name)}'
+
+
+def _frame_name(frame: FrameType) -> str:
+    return _code_name(frame.f_code, frame.f_globals.get('__name__'))
+
+
+def _builtin_name(func: Any) -> str:
+    return f'{getattr(func, "__module__", None) or "builtins"}:{getattr(func, "__qualname__", repr(func))}'
+
+
+def _await_chain(awaitable: Any) -> list[str]:
+    # walks the coroutines a suspended task is waiting on, down to the future
+    names = []
+
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None) or getattr(awaitable, 'gi_frame', None)
+
+        if frame is None:
+            break
+
+        names.append(_frame_name(frame))
+        awaitable = getattr(awaitable, 'cr_await', None) or getattr(awaitable, 'gi_yieldfrom', None)
+
+    return names
+
+
+class RequestProfile:
+    """
+    Deterministic call tree of one request, kept as collapsed stacks with
+    their self time in nanoseconds. The profiler is only installed while the
+    request's own coroutine is being stepped, so concurrent requests on the
+    same event loop are not attributed to it. Time spent suspended is
+    charged to the awaiting stack under an `<await>` frame.
+    """
+
+    def __init__(self, request_id: str, method: str, path: str):
+        self.request_id: str = request_id
+        self.method: str = method
+        self.path: str = path
+        self.route: str | None = None
+        self.status_code: int | None = None
+        self.started_at: float = time()
+        self.duration_ns: int = 0
+        self.cpu_ns: int = 0
+        self.await_ns: int = 0
+        self.stacks: dict[str, int] = {}
+        self._keys: list[str] = ['']
+        self._last_ns: int = 0
+
+    def _charge(self, now: int) -> None:
+        key = self._keys[-1]
+
+        if key:
+            self.stacks[key] = self.stacks.get(key, 0) + now - self._last_ns
+
+        self._last_ns = now
+
+    def _callback(self, frame: FrameType, event: str, arg: Any) -> None:
+        now = perf_counter_ns()
+
+        # the calls made by the stepping wrapper itself are not part of the request
+        if frame.f_code is _step_code:
+            self._last_ns = now
+            return
+
+        self._charge(now)
+
+        if event == 'call':
+            self._keys.append(f'{self._keys[-1]};{_frame_name(frame)}')
+        elif event == 'c_call':
+            self._keys.append(f'{self._keys[-1]};{_builtin_name(arg)}')
+        elif len(self._keys) > 1:
+            self._keys.pop()
+
+    def _enter(self) -> int:
+        now = perf_counter_ns()
+        self._keys = ['']
+        self._last_ns = now
+        return now
+
+    def _exit(self, entered_at: int) -> None:
+        now = perf_counter_ns()
+        self._charge(now)
+        self.cpu_ns += now - entered_at
+
+    def _record_await(self, stack: list[str], duration_ns: int) -> None:
+        key = ';'.join((*stack, AWAIT_FRAME))
+        self.stacks[f';{key}'] = self.stacks.get(f';{key}', 0) + duration_ns
+        self.await_ns += duration_ns
+
+    def run(self, coro: Coroutine) -> 'ProfiledCoroutine':
+        return ProfiledCoroutine(self, coro)
+
+    def finish(self, route: str | None, status_code: int | None, duration_ns: int) -> None:
+        self.route = route
+        self.status_code = status_code
+        self.duration_ns = duration_ns
+
+    def to_collapsed(self) -> str:
+        # one `frame;frame;frame count` line per stack, in microseconds, as
+        # read by flamegraph.pl, speedscope and inferno
+        root = f'{self.method} {self.route or self.path}'
+        return '\n'.join(
+            f'{root}{stack} {duration_ns // 1000}'
+            for stack, duration_ns in sorted(self.stacks.items())
+            if duration_ns >= 1000
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'request_id': self.request_id,
+            'method': self.method,
+            'path': self.path,
+            'route': self.route,
+            'status_code': self.status_code,
+            'started_at': self.started_at,
+            'duration_ms': round(self.duration_ns / 1_000_000, 4),
+            'cpu_ms': round(self.cpu_ns / 1_000_000, 4),
+            'await_ms': round(self.await_ns / 1_000_000, 4),
+            'stacks': len(self.stacks)
+        }
+
+
+class ProfiledCoroutine:
+    def __init__(self, profile: RequestProfile, coro: Coroutine):
+        self.profile: RequestProfile = profile
+        self.coro: Coroutine = coro
+        self._suspended_at: int | None = None
+        self._await_stack: list[str] = []
+
+    def __await__(self) -> Generator:
+        return self
+
+    def __iter__(self) -> Generator:
+        return self
+
+    def __next__(self) -> Any:
+        return self._step(self.coro.send, None)
+
+    def send(self, value: Any) -> Any:
+        return self._step(self.coro.send, value)
+
+    def throw(self, *args) -> Any:
+        return self._step(self.coro.throw, *args)
+
+    def close(self) -> None:
+        self.coro.close()
+
+    def _step(self, method, *args) -> Any:
+        profile = self.profile
+        entered_at = profile._enter()
+
+        if self._suspended_at is not None:
+            profile._record_await(self._await_stack, entered_at - self._suspended_at)
+
+        previous = sys.getprofile()
+        sys.setprofile(profile._callback)
+
+        try:
+            result = method(*args)
+        finally:
+            sys.setprofile(previous)
+            profile._exit(entered_at)
+
+        self._await_stack = _await_chain(self.coro)
+        self._suspended_at = perf_counter_ns()
+        return result
+
+
+_step_code: CodeType = ProfiledCoroutine._step.__code__
+
+
+class ProfileStore:
+    def __init__(self, maxsize: int):
+        self.maxsize: int = max(1, maxsize)
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles[profile.request_id] = profile
+        self._profiles.move_to_end(profile.request_id)
+
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def get(self, request_id: str) -> RequestProfile | None:
+        return self._profiles.get(request_id)
+
+    def list(self) -> list[dict]:
+        return [profile.to_dict() for profile in reversed(self._profiles.values())]
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+
+# profiles are kept per worker process
+profile_store = ProfileStore(core_configs.profiling_max_profiles)
+
+
+__all__ = ['RequestProfile', 'ProfileStore', 'profile_store']
@@ -0,0 +1,182 @@
+from time import time
+from typing import (
+    Any,
+    Callable,
+    TypeVar
+)
+
+from ..configs import core_configs
+from .shared_cache import SharedMemoryCache
+
+R = TypeVar('R')
+
+
+class RateLimitStore:
+    """
+    Small expiring key-value store for limiter state. Entries live in a
+    dict of `(value, expires_at)` tuples that is swept every
+    `cleanup_interval` seconds, or in a shared memory cache when one is
+    given so that all workers on a node see the same state. When the shared
+    lock cannot be taken in time the local dict is used instead.
+    """
+
+    def __init__(self, shared: SharedMemoryCache | None, cleanup_interval: float):
+        self.shared: SharedMemoryCache | None = shared
+        self.cleanup_interval: float = cleanup_interval
+        self._entries: dict[str, tuple[Any, float]] = {}
+        self._next_cleanup: float = time() + cleanup_interval
+
+    def _cleanup(self, now: float) -> None:
+        if now < self._next_cleanup:
+            return
+
+        self._next_cleanup = now + self.cleanup_interval
+
+        for key in [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+    def get(self, key: str) -> Any:
+        if self.shared is not None:
+            return self.shared.get(key)
+
+        entry = self._entries.get(key)
+        return entry[0] if entry is not None and entry[1] > time() else None
+
+    def update(self, key: str, func: Callable[[Any], tuple[Any, R]], ttl: float) -> R:
+        if self.shared is not None:
+            updated, result = self.shared.update(key, func, ttl)
+
+            if updated:
+                return result
+
+        now = time()
+        self._cleanup(now)
+        entry = self._entries.get(key)
+        value, result = func(entry[0] if entry is not None and entry[1] > now else None)
+        self._entries[key] = (value, now + ttl)
+        return result
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+        if self.shared is not None:
+            # an entry that expires immediately reads as missing
+            self.shared.update(key, lambda _: (None, None), 0)
+
+
+class TokenBucketLimiter:
+    def __init__(self, store: RateLimitStore):
+        self.store: RateLimitStore = store
+
+    @staticmethod
+    def _tokens(bucket: tuple[float, float] | None, now: float, rate: float, burst: float) -> float:
+        return burst if bucket is None else min(burst, bucket[0] + (now - bucket[1]) * rate)
+
+    def peek(self, key: str, rate: float, burst: float, cost: float = 1) -> float:
+        """
+        Returns the seconds until `cost` tokens are available, without
+        taking any.
+        """
+        cost = min(cost, burst)
+        tokens = self._tokens(self.store.get(key), time(), rate, burst)
+        return max(0.0, (cost - tokens) / rate)
+
+    def acquire(self, key: str, rate: float, burst: float, cost: float = 1) -> float:
+        """
+        Takes `cost` tokens from the bucket and returns 0, or returns the
+        seconds until enough tokens are available when there are too few.
+        """
+        now = time()
+        cost = min(cost, burst)
+
+        def take(bucket: tuple[float, float] | None) -> tuple[tuple[float, float], float]:
+            tokens = self._tokens(bucket, now, rate, burst)
+
+            if tokens >= cost:
+                return (tokens - cost, now), 0.0
+
+            return (tokens, now), (cost - tokens) / rate
+
+        # a bucket left alone for burst / rate seconds is full again and can go
+        return self.store.update(key, take, burst / rate + 1)
+
+    def acquire_all(self, keys: list[str], rate: float, burst: float, cost: float = 1) -> float:
+        # only debit when every bucket allows it, so a request limited by
+        # one bucket does not drain the others
+        retry_after = max(self.peek(key, rate, burst, cost) for key in keys)
+
+        if retry_after > 0:
+            return retry_after
+
+        return max(self.acquire(key, rate, burst, cost) for key in keys)
+
+
+class LoginThrottle:
+    """
+    Progressive back-off for failed logins per identifier. The first
+    `free_attempts` failures are not delayed; after that every failure
+    doubles the wait, starting at `base_delay` and capped at `max_delay`.
+    Failures are forgotten `window` seconds after the last one.
+    """
+
+    def __init__(self, store: RateLimitStore, free_attempts: int, base_delay: float, max_delay: float, window: float):
+        self.store: RateLimitStore = store
+        self.free_attempts: int = free_attempts
+        self.base_delay: float = base_delay
+        self.max_delay: float = max_delay
+        self.window: float = window
+
+    @staticmethod
+    def _key(identifier: str) -> str:
+        return f'login:{identifier.strip().lower()}'
+
+    def retry_after(self, identifier: str) -> float:
+        state = self.store.get(self._key(identifier))
+
+        if state is None:
+            return 0.0
+
+        return max(0.0, state[1] - time())
+
+    def record_failure(self, identifier: str) -> float:
+        now = time()
+
+        def fail(state: tuple[int, float] | None) -> tuple[tuple[int, float], float]:
+            failures = (state[0] if state is not None else 0) + 1
+            excess = failures - self.free_attempts
+            delay = min(self.max_delay, self.base_delay * 2 ** (excess - 1)) if excess > 0 else 0.0
+            return (failures, now + delay), delay
+
+        return self.store.update(self._key(identifier), fail, self.window + self.max_delay)
+
+    def reset(self, identifier: str) -> None:
+        self.store.delete(self._key(identifier))
+
+
+# created at import so that workers forked by app.server share one mapping
+_shared_store: SharedMemoryCache | None = (
+    SharedMemoryCache(
+        slots=core_configs.rate_limit_shared_slots,
+        slot_size=256
+    )
+    if core_configs.rate_limit_backend == 'shared' else None
+)
+
+rate_limit_store = RateLimitStore(_shared_store, cleanup_interval=core_configs.rate_limit_cleanup_interval)
+rate_limiter = TokenBucketLimiter(rate_limit_store)
+login_throttle = LoginThrottle(
+    rate_limit_store,
+    free_attempts=core_configs.login_free_attempts,
+    base_delay=core_configs.login_backoff_base,
+    max_delay=core_configs.login_backoff_max,
+    window=core_configs.login_failure_window
+)
+
+
+__all__ = [
+    'RateLimitStore',
+    'TokenBucketLimiter',
+    'LoginThrottle',
+    'rate_limiter',
+    'login_throttle'
+]
@@ -10,16 +10,17 @@ from contextvars import (
 from ..configs import core_configs
 
 
-logger = logging.getLogger(core_configs.logger_name)
+logger = logging.getLogger(f'{core_configs.logger_name}.requests')
 
 
 REQUEST_ID_CTX_KEY: Final[str] = core_configs.request_id_ctx_key
 _request_id_ctx_var: ContextVar[str | None] = ContextVar(REQUEST_ID_CTX_KEY, default=None)
+_request_scope_ctx_var: ContextVar[dict | None] = ContextVar('request_scope', default=None)
 
 
 async def set_request_id(request_id: str) -> Token:
-    logger.info(f'Session context initialized for request handling: {request_id}')
     ctx_token = _request_id_ctx_var.set(request_id)
+    logger.info('Session context initialized for request handling: %s', request_id)
     return ctx_token
 
 
@@ -29,3 +30,21 @@ def get_request_id() -> str | None:
 
 async def remove_request_id(token: Token) -> None:
     _request_id_ctx_var.reset(token)
+
+
+def set_request_scope(scope: dict) -> Token:
+    return _request_scope_ctx_var.set(scope)
+
+
+def get_route_path(scope: dict | None = None) -> str | None:
+    scope = scope if scope is not None else _request_scope_ctx_var.get()
+
+    if scope is None:
+        return None
+
+    # the matched route is added to the scope by the router
+    return getattr(scope.get('route'), 'path', None)
+
+
+def remove_request_scope(token: Token) -> None:
+    _request_scope_ctx_var.reset(token)
@@ -1,22 +1,85 @@
-from passlib.context import CryptContext
-
-pwd_context = CryptContext(
-    # append the hash(es) list you wish to support.
-    schemes=['argon2'],
-    # if not mentioned it will use the first hasher in the schemes list.
-    default='argon2',
-    # either you can specify hasher list you need to depricate
-    # or 'auto' mark all but first hasher in schemes list as deprecated
-    deprecated='auto'
+import asyncio
+import base64
+
+from time import perf_counter
+from functools import (
+    lru_cache,
+    partial
+)
+from jwt.algorithms import get_default_algorithms
+from concurrent.futures import ThreadPoolExecutor
+
+from ..configs import core_configs
+from .metrics import (
+    password_hash_duration_seconds,
+    password_hash_queue_seconds
+)
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context():
+    # passlib and the argon2 backend are only needed by the auth routes, so
+    # they are loaded on first use instead of when the app is imported
+    from passlib.context import CryptContext
+
+    return CryptContext(
+        # append the hash(es) list you wish to support.
+        schemes=['argon2'],
+        # if not mentioned it will use the first hasher in the schemes list.
+        default='argon2',
+        # either you can specify hasher list you need to depricate
+        # or 'auto' mark all but first hasher in schemes list as deprecated
+        deprecated='auto'
+    )
+
+
+# argon2 releases the GIL, so hashing on a small thread pool keeps the event
+# loop responsive while logins are being verified
+hashing_executor = ThreadPoolExecutor(
+    max_workers=core_configs.hashing_workers,
+    thread_name_prefix='password-hashing'
 )
 
 
+@lru_cache(maxsize=1)
+def get_signing_key():
+    # parsing the PEM key is far more expensive than signing with it
+    algorithm = get_default_algorithms()[core_configs.token_algorithm]
+    return algorithm.prepare_key(base64.b64decode(core_configs.private_key))
+
+
+@lru_cache(maxsize=1)
+def get_verification_key():
+    algorithm = get_default_algorithms()[core_configs.token_algorithm]
+    return algorithm.prepare_key(base64.b64decode(core_configs.public_key))
+
+
+def _timed_call(submitted_at: float, func, *args, **kwargs) -> tuple:
+    started_at = perf_counter()
+    result = func(*args, **kwargs)
+    return result, started_at - submitted_at, perf_counter() - started_at
+
+
+async def _run_hashing(operation: str, func, **kwargs):
+    loop = asyncio.get_running_loop()
+    result, queued_s, duration_s = await loop.run_in_executor(
+        hashing_executor,
+        partial(_timed_call, perf_counter(), func, **kwargs)
+    )
+
+    password_hash_queue_seconds.observe(queued_s, (operation,))
+    password_hash_duration_seconds.observe(duration_s, (operation,))
+    return result
+
+
 async def hash_password(password: str) -> str:
-    return pwd_context.hash(secret=password)
+    return await _run_hashing('hash', get_pwd_context().hash, secret=password)
 
 
 async def verify_password(password: str, hashed_password: str) -> tuple[bool, str | None]:
-    is_verified, updated_password = pwd_context.verify_and_update(
+    is_verified, updated_password = await _run_hashing(
+        'verify',
+        get_pwd_context().verify_and_update,
         secret=password,
         hash=hashed_password
     )
@@ -0,0 +1,258 @@
+import fcntl
+import hashlib
+import mmap
+import pickle
+import struct
+import tempfile
+import threading
+
+from time import (
+    perf_counter,
+    time
+)
+from typing import (
+    Any,
+    Callable,
+    TypeVar
+)
+
+R = TypeVar('R')
+
+# key hash, expiry, last access, key length, value length
+_slot_header = struct.Struct('<QddII')
+
+
+class SharedCacheStats:
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+        self.sets: int = 0
+        self.evictions: int = 0
+        self.rejected: int = 0
+        self.lock_timeouts: int = 0
+
+    def to_dict(self) -> dict:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'sets': self.sets,
+            'evictions': self.evictions,
+            'rejected': self.rejected,
+            'lock_timeouts': self.lock_timeouts
+        }
+
+
+class SharedMemoryCache:
+    """
+    Fixed-size cache in an anonymous shared mmap. The slab is split into
+    equally sized slots addressed by an open-addressing index over the key
+    hash; a key lives in one of `max_probes` consecutive slots. When all of
+    them are taken, the least recently used slot among them is evicted.
+
+    The mapping and its lock file are inherited by processes forked after
+    it is created, which is how the workers started by `app.server` share
+    it. Counters in `stats` are per process.
+
+    Access is serialized with a POSIX record lock on an unlinked file. The
+    kernel drops it when the holding process dies, so a worker killed in a
+    critical section cannot wedge the others. The lock is only ever tried
+    without blocking, for at most `lock_timeout` seconds; when it is busy
+    the operation counts as a miss. Slots are invalidated before they are
+    rewritten, so a write cut short leaves an empty slot, not a torn entry.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        slot_size: int,
+        max_probes: int = 8,
+        lock_timeout: float = 0.0002
+    ):
+        if slot_size <= _slot_header.size:
+            raise ValueError(f'Slot size must be larger than {_slot_header.size} bytes.')
+
+        self.slots: int = max(1, slots)
+        self.slot_size: int = slot_size
+        self.max_probes: int = min(max(1, max_probes), self.slots)
+        self.lock_timeout: float = lock_timeout
+        self.stats = SharedCacheStats()
+        self._buffer = mmap.mmap(-1, self.slots * self.slot_size)
+        self._lock_file = tempfile.TemporaryFile()
+        # record locks do not exclude threads of the same process
+        self._thread_lock = threading.Lock()
+
+    def _acquire(self) -> bool:
+        if not self._thread_lock.acquire(blocking=False):
+            self.stats.lock_timeouts += 1
+            return False
+
+        deadline = perf_counter() + self.lock_timeout
+
+        while True:
+            try:
+                fcntl.lockf(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return True
+            except OSError:
+                if perf_counter() >= deadline:
+                    self._thread_lock.release()
+                    self.stats.lock_timeouts += 1
+                    return False
+
+    def _release(self) -> None:
+        fcntl.lockf(self._lock_file, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    @staticmethod
+    def _hash(key: bytes) -> int:
+        # the builtin hash is salted per interpreter, so it is not usable
+        # across processes that were not forked from the same parent
+        return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little') or 1
+
+    def _probe(self, key_hash: int):
+        start = key_hash % self.slots
+
+        for i in range(self.max_probes):
+            offset = ((start + i) % self.slots) * self.slot_size
+            yield offset, _slot_header.unpack_from(self._buffer, offset)
+
+    def _read_key(self, offset: int, key_len: int) -> bytes:
+        start = offset + _slot_header.size
+        return self._buffer[start:start + key_len]
+
+    def _lookup(self, encoded_key: bytes, key_hash: int, now: float) -> bytes | None:
+        for offset, (slot_hash, expires_at, _, key_len, value_len) in self._probe(key_hash):
+            if slot_hash == 0:
+                break
+
+            if slot_hash != key_hash or self._read_key(offset, key_len) != encoded_key:
+                continue
+
+            if expires_at > now:
+                _slot_header.pack_into(self._buffer, offset, slot_hash, expires_at, now, key_len, value_len)
+                start = offset + _slot_header.size + key_len
+                return self._buffer[start:start + value_len]
+
+            break
+
+        return None
+
+    def _store(self, encoded_key: bytes, key_hash: int, payload: bytes, ttl: float, now: float) -> None:
+        target: int | None = None
+        victim: tuple[float, int] | None = None
+
+        for offset, (slot_hash, expires_at, accessed_at, key_len, _) in self._probe(key_hash):
+            if slot_hash == 0 or expires_at <= now:
+                target = target if target is not None else offset
+
+                if slot_hash == 0:
+                    break
+
+                continue
+
+            if slot_hash == key_hash and self._read_key(offset, key_len) == encoded_key:
+                target = offset
+                break
+
+            if victim is None or accessed_at < victim[0]:
+                victim = (accessed_at, offset)
+
+        if target is None:
+            target = victim[1]
+            self.stats.evictions += 1
+
+        _slot_header.pack_into(self._buffer, target, 0, 0.0, 0.0, 0, 0)
+        start = target + _slot_header.size
+        self._buffer[start:start + len(encoded_key)] = encoded_key
+        self._buffer[start + len(encoded_key):start + len(encoded_key) + len(payload)] = payload
+        _slot_header.pack_into(self._buffer, target, key_hash, now + ttl, now, len(encoded_key), len(payload))
+
+    def _fits(self, encoded_key: bytes, payload: bytes) -> bool:
+        # entries that do not fit in one slot are left to the local tier
+        if _slot_header.size + len(encoded_key) + len(payload) > self.slot_size:
+            self.stats.rejected += 1
+            return False
+
+        return True
+
+    def get(self, key: str) -> Any:
+        encoded_key = key.encode()
+        key_hash = self._hash(encoded_key)
+
+        if not self._acquire():
+            return None
+
+        try:
+            payload = self._lookup(encoded_key, key_hash, time())
+        finally:
+            self._release()
+
+        if payload is None:
+            self.stats.misses += 1
+            return None
+
+        self.stats.hits += 1
+        return pickle.loads(payload)
+
+    def set(self, key: str, value: Any, ttl: float) -> bool:
+        encoded_key = key.encode()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        if not self._fits(encoded_key, payload):
+            return False
+
+        key_hash = self._hash(encoded_key)
+
+        if not self._acquire():
+            return False
+
+        try:
+            self._store(encoded_key, key_hash, payload, ttl, time())
+        finally:
+            self._release()
+
+        self.stats.sets += 1
+        return True
+
+    def update(self, key: str, func: Callable[[Any], tuple[Any, R]], ttl: float) -> tuple[bool, R | None]:
+        """
+        Calls `func` with the current value, or None when there is none, and
+        stores the first item it returns while holding the lock, so read,
+        modify and write are atomic across processes. Returns whether the
+        update happened and the second item `func` returned.
+        """
+        encoded_key = key.encode()
+        key_hash = self._hash(encoded_key)
+
+        if not self._acquire():
+            return False, None
+
+        try:
+            now = time()
+            current = self._lookup(encoded_key, key_hash, now)
+            value, result = func(pickle.loads(current) if current is not None else None)
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+            if not self._fits(encoded_key, payload):
+                return False, None
+
+            self._store(encoded_key, key_hash, payload, ttl, now)
+        finally:
+            self._release()
+
+        self.stats.sets += 1
+        return True, result
+
+    def clear(self) -> bool:
+        if not self._acquire():
+            return False
+
+        try:
+            for i in range(self.slots):
+                _slot_header.pack_into(self._buffer, i * self.slot_size, 0, 0.0, 0.0, 0, 0)
+        finally:
+            self._release()
+
+        return True
+
+
+__all__ = ['SharedMemoryCache']
@@ -0,0 +1,217 @@
+import asyncio
+import logging
+
+from time import perf_counter_ns
+from contextlib import AsyncExitStack
+from typing import (
+    Awaitable,
+    Callable
+)
+
+from fastapi import FastAPI
+from sqlalchemy import (
+    select,
+    func,
+    or_,
+    asc
+)
+
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.ext.asyncio.engine import (
+    AsyncConnection,
+    AsyncEngine
+)
+
+from ..configs import (
+    core_configs,
+    db_configs
+)
+from ..database.core import get_engine
+from ..database.replicas import replica_router
+from ..database.loaders import users_by_ids_statement
+from ..database.statements import SKIP_FINGERPRINT_OPTION
+from ..models.user import UserModel
+from ..schemas.enums import (
+    GrantType,
+    UserStatus,
+    UserType
+)
+from ..schemas.request import (
+    LoginRequest,
+    QueryParams
+)
+from ..schemas.response import ResponseModel
+from ..schemas.user import OutUser
+from .core import json_encode_response_model
+from .security import (
+    get_pwd_context,
+    get_signing_key,
+    get_verification_key
+)
+
+logger = logging.getLogger(core_configs.logger_name)
+
+_user_list_statement = select(UserModel).order_by(asc(UserModel.created_at))
+
+# mirrors the statements issued by the hot request paths so their prepared
+# statements and compiled SQL are cached before the first request arrives
+_warmup_statements: tuple = (
+    (users_by_ids_statement, {'ids': []}),
+    (
+        select(UserModel).where(or_(UserModel.email == '', UserModel.username == '')),
+        {}
+    ),
+    (select(func.count()).select_from(_user_list_statement), {}),
+    (_user_list_statement.offset(0).limit(10), {})
+)
+
+
+async def _prime_connection(conn: AsyncConnection) -> None:
+    conn = await conn.execution_options(**{SKIP_FINGERPRINT_OPTION: True})
+
+    for statement, parameters in _warmup_statements:
+        await conn.execute(statement, parameters)
+
+    await conn.rollback()
+
+
+async def _warm_engine(engine: AsyncEngine) -> int:
+    count = 1
+
+    # without a local pool connections are not kept, but the first one still
+    # primes the dialect and the compiled statement cache
+    if isinstance(engine.pool, QueuePool):
+        count = engine.pool.size()
+
+        if db_configs.warmup_pool_connections is not None:
+            count = min(count, db_configs.warmup_pool_connections)
+
+    # connections are held until all of them are open so the pool has to
+    # establish each one instead of handing the same connection back
+    async with AsyncExitStack() as stack:
+        for _ in range(count):
+            conn = await stack.enter_async_context(engine.connect())
+            await _prime_connection(conn)
+
+    return count
+
+
+async def warm_database() -> None:
+    count = await _warm_engine(get_engine())
+
+    for replica in replica_router.replicas:
+        count += await _warm_engine(replica.engine)
+
+    logger.info('Opened and primed %d database connections', count)
+
+
+_sample_user: dict = {
+    'id': '00000000-0000-4000-8000-000000000000',
+    'username': 'warmup',
+    'email': 'warmup@example.com',
+    'type': UserType.ADMIN,
+    'status': UserStatus.ACTIVE,
+    'created_at': '2025-01-01T00:00:00+00:00',
+    'updated_at': '2025-01-01T00:00:00+00:00',
+    'current_user_id': '00000000-0000-4000-8000-000000000000'
+}
+
+
+async def build_schemas() -> None:
+    # the validators and serializers are built with the classes, but the code
+    # they call into is first loaded on use, so the hot request and response
+    # models each handle a representative value once
+    LoginRequest.model_validate({
+        'grant_type': GrantType.PASSWORD,
+        'credentials': {'identifier': 'warmup@example.com', 'password': 'Warmup#123'}
+    })
+    QueryParams.model_validate({'sort_by': 'created_at', 'page': '1', 'per_page': '10'})
+    user = OutUser.model_validate(_sample_user)
+
+    response = ResponseModel(status=200, success=True, payload=user.model_dump(mode='json'))
+    json_encode_response_model(response)
+    response.model_dump_json()
+
+
+async def render_openapi(app: FastAPI) -> None:
+    app.openapi()
+
+
+async def load_keys() -> None:
+    get_signing_key()
+    get_verification_key()
+    get_pwd_context()
+
+
+class Warmup:
+    def __init__(self, timeout: float):
+        self.timeout: float = timeout
+        self.steps: dict[str, dict] = {}
+        self.is_complete: bool = False
+        self._task: asyncio.Task | None = None
+
+    async def _run_step(self, name: str, step: Callable[[], Awaitable[None]]) -> None:
+        start_time_ns = perf_counter_ns()
+
+        try:
+            await step()
+        except Exception as e:
+            logger.error('Warmup step %s failed: %s', name, e)
+            self.steps[name] = {'status': 'failed', 'error': str(e) or type(e).__name__}
+            return
+
+        duration_ms: float = (perf_counter_ns() - start_time_ns) / 1_000_000
+        self.steps[name] = {'status': 'complete', 'duration_ms': round(duration_ms, 4)}
+
+    async def run(self, app: FastAPI) -> None:
+        steps = (
+            ('keys', load_keys),
+            ('schemas', build_schemas),
+            ('openapi', lambda: render_openapi(app)),
+            ('database', warm_database)
+        )
+
+        start_time_ns = perf_counter_ns()
+
+        try:
+            for name, step in steps:
+                await asyncio.wait_for(
+                    self._run_step(name, step),
+                    timeout=max(0.0, self.timeout - (perf_counter_ns() - start_time_ns) / 1_000_000_000)
+                )
+        except asyncio.TimeoutError:
+            logger.error('Warmup did not finish within %.1f seconds', self.timeout)
+
+        # a failed step only costs latency, so traffic is admitted either way
+        self.is_complete = True
+        logger.info(
+            'Warmup finished in %.4f milliseconds: %s',
+            (perf_counter_ns() - start_time_ns) / 1_000_000, self.steps
+        )
+
+    def start(self, app: FastAPI) -> None:
+        if not core_configs.warmup_enabled:
+            self.is_complete = True
+            return
+
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run(app))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+
+warmup = Warmup(timeout=core_configs.warmup_timeout)
+
+
+__all__ = ['Warmup', 'warmup']
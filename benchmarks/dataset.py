@@ -0,0 +1,146 @@
+"""
+Applies the migrations to the configured Postgres database and bulk loads
+synthetic users through COPY.
+
+    uv run python -m benchmarks.dataset --users 1000000
+
+Generated usernames are `lt_<n>` and their password is PASSWORDS[n % 8],
+so load tests can log in as any of them. Argon2 is only run once per entry
+in PASSWORDS; every generated row reuses one of those hashes. Rows are
+appended after the existing generated users unless --truncate is given.
+The first SEED_ADMINS users are always verified, active admins.
+"""
+import argparse
+import asyncio
+import random
+
+from time import perf_counter
+from uuid import UUID
+from datetime import (
+    datetime,
+    timedelta,
+    timezone
+)
+from typing import Iterator
+
+import asyncpg
+
+from alembic import command
+from alembic.config import Config
+
+from app.configs import db_configs
+from app.database.core import url_object
+from app.schemas.enums import (
+    UserType,
+    UserStatus
+)
+from app.utils.security import get_pwd_context
+
+USERNAME_PREFIX: str = 'lt_'
+PASSWORDS: tuple[str, ...] = tuple(f'Loadtest#{i}' for i in range(8))
+SEED_ADMINS: int = 16
+
+_columns: tuple[str, ...] = (
+    'id', 'username', 'email', 'password', 'type', 'status',
+    'is_verified', 'is_deleted', 'created_at', 'updated_at'
+)
+_domains: tuple[str, ...] = ('gmail.com', 'outlook.com', 'yahoo.com', 'icloud.com', 'example.com', 'example.org')
+_domain_weights: tuple[int, ...] = (45, 20, 12, 10, 8, 5)
+_type_weights: dict[UserType, float] = {UserType.ADMIN: 0.5, UserType.BUSINESS: 9.5, UserType.CUSTOMER: 90}
+_status_weights: dict[UserStatus, float] = {UserStatus.ACTIVE: 80, UserStatus.INACTIVE: 15, UserStatus.SUSPENDED: 5}
+
+
+def password_for(username: str) -> str:
+    return PASSWORDS[int(username.removeprefix(USERNAME_PREFIX)) % len(PASSWORDS)]
+
+
+def run_migrations(alembic_ini: str = 'alembic.ini') -> None:
+    config = Config(alembic_ini)
+    # configparser treats % as interpolation, which passwords may contain
+    config.set_main_option('sqlalchemy.url', url_object.render_as_string(hide_password=False).replace('%', '%%'))
+    command.upgrade(config, 'head')
+
+
+def generate_users(start: int, count: int, seed: int, hashes: list[str]) -> Iterator[tuple]:
+    rng = random.Random(seed + start)
+    now = datetime.now(timezone.utc)
+    types, type_weights = zip(*_type_weights.items())
+    statuses, status_weights = zip(*_status_weights.items())
+
+    for n in range(start, start + count):
+        if n < SEED_ADMINS:
+            user_type, status, is_verified, is_deleted = UserType.ADMIN, UserStatus.ACTIVE, True, False
+        else:
+            user_type = rng.choices(types, type_weights)[0]
+            status = rng.choices(statuses, status_weights)[0]
+            is_verified = rng.random() < 0.85
+            is_deleted = rng.random() < 0.02
+
+        # squaring skews sign ups towards recent dates, like a growing product
+        created_at = now - timedelta(days=3 * 365 * rng.random() ** 2)
+        updated_at = created_at + (now - created_at) * rng.random() ** 3
+
+        yield (
+            UUID(int=rng.getrandbits(128), version=4),
+            f'{USERNAME_PREFIX}{n}',
+            f'{USERNAME_PREFIX}{n}@{rng.choices(_domains, _domain_weights)[0]}',
+            hashes[n % len(hashes)],
+            user_type.value,
+            status.value,
+            is_verified,
+            is_deleted,
+            created_at,
+            updated_at
+        )
+
+
+async def load_users(count: int, batch_size: int, seed: int, truncate: bool) -> None:
+    conn = await asyncpg.connect(
+        host=db_configs.db_host,
+        port=db_configs.db_port,
+        user=db_configs.db_user,
+        password=db_configs.db_pw,
+        database=db_configs.db_name
+    )
+
+    try:
+        if truncate:
+            await conn.execute("DELETE FROM users WHERE username LIKE 'lt\\_%'")
+
+        start = await conn.fetchval("SELECT count(*) FROM users WHERE username LIKE 'lt\\_%'")
+        hashes = [get_pwd_context().hash(password) for password in PASSWORDS]
+        started_at = perf_counter()
+        loaded = 0
+
+        while loaded < count:
+            size = min(batch_size, count - loaded)
+            await conn.copy_records_to_table(
+                'users',
+                records=generate_users(start + loaded, size, seed, hashes),
+                columns=_columns
+            )
+            loaded += size
+            print(f'{loaded:>12,} users loaded, {loaded / (perf_counter() - started_at):>10,.0f} rows/s')
+
+        await conn.execute('ANALYZE users')
+    finally:
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--truncate', action='store_true', help='delete previously generated users first')
+    parser.add_argument('--skip-migrations', action='store_true')
+    args = parser.parse_args()
+
+    if not args.skip_migrations:
+        run_migrations()
+
+    asyncio.run(load_users(args.users, args.batch_size, args.seed, args.truncate))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Micro-benchmarks for the request hot paths. Everything runs in-process and
+offline: tokens, ORM rows and requests are built in memory.
+
+    uv run python -m benchmarks.hot_paths --save baseline.json
+    uv run python -m benchmarks.hot_paths --compare baseline.json --threshold 0.15
+
+With --compare the run exits with status 1 when any case is slower than
+its baseline by more than the threshold. Baselines are machine specific,
+so record them on the machine that runs the comparison.
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import logging
+import platform
+import sys
+
+from time import perf_counter_ns
+from uuid import uuid4
+from datetime import (
+    datetime,
+    timezone
+)
+from typing import Callable
+
+from starlette.requests import Request
+
+from app.middlewares import AddRequestIdMiddleware
+from app.models.user import UserModel
+from app.schemas.enums import (
+    UserType,
+    UserStatus
+)
+from app.schemas.request import QueryParams
+from app.schemas.response import ResponseModel
+from app.schemas.user import OutUser
+from app.services.auth_service import (
+    _decode_token,
+    _generate_tokens
+)
+from app.utils.core import json_encode_response_model
+from app.utils.security import get_pwd_context
+from .middleware import (
+    build_app,
+    run as run_middleware
+)
+
+ROW_COUNTS: tuple[int, ...] = (1, 10, 100, 1000)
+
+
+def _make_users(count: int) -> list[UserModel]:
+    now = datetime.now(timezone.utc)
+
+    return [UserModel(
+        id=uuid4(),
+        username=f'user_{i}',
+        email=f'user_{i}@example.com',
+        password='$argon2id$v=19$m=65536,t=3,p=4$c2FsdA$aGFzaA',
+        type=UserType.CUSTOMER.value,
+        status=UserStatus.ACTIVE.value,
+        is_verified=True,
+        is_deleted=False,
+        created_at=now,
+        updated_at=now
+    ) for i in range(count)]
+
+
+def _make_request() -> Request:
+    return Request({
+        'type': 'http',
+        'method': 'GET',
+        'scheme': 'http',
+        'server': ('bench', 80),
+        'path': '/api/v1/users',
+        'root_path': '',
+        'query_string': b'page=2&per_page=10&sort_by=created_at',
+        'headers': [(b'host', b'bench')]
+    })
+
+
+def build_cases() -> dict[str, Callable]:
+    current_user_id = uuid4()
+    token_data = {'id': str(current_user_id), 'identity_type': UserType.ADMIN.value}
+    access_token, _ = asyncio.run(_generate_tokens(token_data))
+    password_hash = get_pwd_context().hash('Benchmark#1')
+    request = _make_request()
+    query_params = QueryParams(page=2, per_page=10)
+
+    cases: dict[str, Callable] = {
+        'jwt_issue': lambda: _generate_tokens(token_data),
+        'jwt_verify': lambda: _decode_token(access_token),
+        'argon2_verify': lambda: get_pwd_context().verify('Benchmark#1', password_hash)
+    }
+
+    for count in ROW_COUNTS:
+        users = _make_users(count)
+        rows = [user.to_dict() for user in users]
+        out_users = [OutUser.model_validate({**row, 'current_user_id': current_user_id}) for row in rows]
+        response = ResponseModel.create_model(
+            request=request,
+            query_params=query_params,
+            payload=out_users,
+            result_count=count * 10
+        )
+
+        cases[f'to_dict[{count}]'] = lambda users=users: [user.to_dict() for user in users]
+        cases[f'out_user_validate[{count}]'] = lambda rows=rows: [
+            OutUser.model_validate({**row, 'current_user_id': current_user_id}) for row in rows
+        ]
+        cases[f'create_model[{count}]'] = lambda out_users=out_users, count=count: ResponseModel.create_model(
+            request=request,
+            query_params=query_params,
+            payload=out_users,
+            result_count=count * 10
+        )
+        cases[f'json_encode_response[{count}]'] = lambda response=response: json_encode_response_model(response)
+
+    return cases
+
+
+async def _time_async(func: Callable, number: int) -> int:
+    start = perf_counter_ns()
+
+    for _ in range(number):
+        await func()
+
+    return perf_counter_ns() - start
+
+
+def _time(func: Callable, number: int, loop: asyncio.AbstractEventLoop, is_async: bool) -> int:
+    if is_async:
+        return loop.run_until_complete(_time_async(func, number))
+
+    start = perf_counter_ns()
+
+    for _ in range(number):
+        func()
+
+    return perf_counter_ns() - start
+
+
+def measure(func: Callable, loop: asyncio.AbstractEventLoop, repeat: int, min_time_ns: int) -> float:
+    # the first call doubles as a warm up and tells sync and async cases apart
+    result = func()
+    is_async = inspect.isawaitable(result)
+
+    if is_async:
+        loop.run_until_complete(result)
+
+    number = 1
+
+    # grow the loop count until one repeat takes long enough to time reliably
+    while (elapsed := _time(func, number, loop, is_async)) < min_time_ns:
+        number = max(number * 2, int(number * min_time_ns / max(elapsed, 1)))
+
+    return min(_time(func, number, loop, is_async) / number for _ in range(repeat))
+
+
+def measure_middleware(requests: int, name_filter: str | None = None) -> dict[str, float]:
+    results = {}
+
+    for name, middleware_class in (('asgi_request', None), ('asgi_request_middleware', AddRequestIdMiddleware)):
+        if name_filter is not None and name_filter not in name:
+            continue
+
+        rates = [asyncio.run(run_middleware(build_app(middleware_class), requests, 1)) for _ in range(3)]
+        results[name] = 1_000_000_000 / max(rates)
+
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    regressions = []
+
+    for name, ns_per_op in results.items():
+        baseline_ns = baseline.get(name)
+
+        if baseline_ns is None:
+            continue
+
+        if ns_per_op > baseline_ns * (1 + threshold):
+            regressions.append(name)
+
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', default=None, help='only run cases whose name contains this text')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1, help='seconds per timed repeat')
+    parser.add_argument('--requests', type=int, default=5000, help='requests per middleware run')
+    parser.add_argument('--save', default=None, help='write the results to this JSON file')
+    parser.add_argument('--compare', default=None, help='compare against a JSON file written by --save')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed slowdown before failing')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    loop = asyncio.new_event_loop()
+    results: dict[str, float] = {}
+
+    for name, func in build_cases().items():
+        if args.filter is None or args.filter in name:
+            results[name] = measure(func, loop, args.repeat, int(args.min_time * 1_000_000_000))
+
+    loop.close()
+
+    results.update(measure_middleware(args.requests, args.filter))
+
+    baseline: dict[str, float] = {}
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    for name, ns_per_op in results.items():
+        line = f'{name:<32} {ns_per_op / 1000:>12.2f} us/op'
+
+        if name in baseline:
+            line += f' {ns_per_op / baseline[name] - 1:>+10.1%} vs baseline'
+
+        print(line)
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results
+            }, f, indent=2)
+
+    regressions = compare(results, baseline, args.threshold)
+
+    if regressions:
+        print(f'\nRegressed by more than {args.threshold:.0%}: {", ".join(regressions)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
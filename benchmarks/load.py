@@ -0,0 +1,279 @@
+"""
+Drives weighted scenarios against a running server at a fixed concurrency
+and reports latency percentiles per scenario alongside the database time
+each response reported in its Server-Timing header.
+
+    uv run python -m benchmarks.dataset --users 1000000 --truncate
+    RATE_LIMIT_ENABLED=false uv run python -m app.server &
+    uv run python -m benchmarks.load --concurrency 64 --duration 60
+
+Accounts come from the users generated by benchmarks.dataset. Admin tokens
+are used for the list and get-by-id scenarios, customer tokens for
+/oauth/auth and PATCH /users/me.
+"""
+import argparse
+import asyncio
+import json
+import random
+import re
+import statistics
+
+from time import perf_counter
+from typing import (
+    Awaitable,
+    Callable
+)
+
+import asyncpg
+import httpx
+
+from app.configs import db_configs
+from app.schemas.enums import (
+    UserType,
+    UserStatus
+)
+from .dataset import (
+    USERNAME_PREFIX,
+    password_for
+)
+
+SORT_COLUMNS: tuple[str, ...] = ('created_at', 'updated_at', 'username', 'email')
+DEFAULT_WEIGHTS: dict[str, float] = {
+    'login': 5,
+    'auth': 30,
+    'list_users': 20,
+    'get_user': 30,
+    'patch_user': 15
+}
+
+_db_time_regex = re.compile(r'(?:^|,\s*)db;dur=([\d.]+)')
+
+
+class ScenarioStats:
+    def __init__(self):
+        self.latencies_ms: list[float] = []
+        self.db_ms: list[float] = []
+        self.statuses: dict[int, int] = {}
+        self.failures: int = 0
+
+    def record(self, response: httpx.Response, duration_ms: float) -> None:
+        self.latencies_ms.append(duration_ms)
+        self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+        match = _db_time_regex.search(response.headers.get('server-timing', ''))
+
+        if match is not None:
+            self.db_ms.append(float(match.group(1)))
+
+    @staticmethod
+    def _percentiles(values: list[float]) -> dict[str, float | None]:
+        if len(values) < 2:
+            value = values[0] if values else None
+            return {'p50': value, 'p95': value, 'p99': value}
+
+        cuts = statistics.quantiles(values, n=100, method='inclusive')
+        return {'p50': round(cuts[49], 3), 'p95': round(cuts[94], 3), 'p99': round(cuts[98], 3)}
+
+    def to_dict(self, elapsed_s: float) -> dict:
+        return {
+            'requests': len(self.latencies_ms),
+            'rps': round(len(self.latencies_ms) / elapsed_s, 2),
+            'errors': sum(count for status, count in self.statuses.items() if status >= 400) + self.failures,
+            'statuses': self.statuses,
+            'latency_ms': self._percentiles(self.latencies_ms),
+            'db_ms': self._percentiles(self.db_ms)
+        }
+
+
+class LoadTest:
+    def __init__(self, client: httpx.AsyncClient, api_prefix: str, accounts: dict[str, list[dict]]):
+        self.client: httpx.AsyncClient = client
+        self.api_prefix: str = api_prefix
+        self.accounts: dict[str, list[dict]] = accounts
+        self.admin_tokens: list[str] = []
+        self.user_tokens: list[str] = []
+        self.stats: dict[str, ScenarioStats] = {}
+
+    async def _login(self, account: dict) -> httpx.Response:
+        return await self.client.post(f'{self.api_prefix}/oauth/token', json={
+            'grant_type': 'password',
+            'credentials': {
+                'identifier': account['username'],
+                'password': password_for(account['username'])
+            }
+        })
+
+    async def authenticate(self, admins: int, users: int) -> None:
+        async def token_for(account: dict) -> str:
+            response = await self._login(account)
+            response.raise_for_status()
+            return response.json()['payload']['access_token']
+
+        self.admin_tokens = await asyncio.gather(*(token_for(a) for a in self.accounts['admins'][:admins]))
+        self.user_tokens = await asyncio.gather(*(token_for(a) for a in self.accounts['users'][:users]))
+
+    @staticmethod
+    def _bearer(token: str) -> dict[str, str]:
+        return {'Authorization': f'Bearer {token}'}
+
+    async def login(self) -> httpx.Response:
+        return await self._login(random.choice(self.accounts['users']))
+
+    async def auth(self) -> httpx.Response:
+        return await self.client.get(
+            f'{self.api_prefix}/oauth/auth',
+            headers=self._bearer(random.choice(self.user_tokens))
+        )
+
+    async def list_users(self) -> httpx.Response:
+        return await self.client.get(f'{self.api_prefix}/users', headers=self._bearer(random.choice(self.admin_tokens)), params={
+            'sort_by': random.choice(SORT_COLUMNS),
+            'sort_order': random.choice(('asc', 'desc')),
+            'page': random.randint(1, 50),
+            'per_page': random.choice((10, 25, 50))
+        })
+
+    async def get_user(self) -> httpx.Response:
+        return await self.client.get(
+            f'{self.api_prefix}/users/{random.choice(self.accounts["ids"])}',
+            headers=self._bearer(random.choice(self.admin_tokens))
+        )
+
+    async def patch_user(self) -> httpx.Response:
+        return await self.client.patch(
+            f'{self.api_prefix}/users/me',
+            headers=self._bearer(random.choice(self.user_tokens)),
+            json={'is_verified': True}
+        )
+
+    async def _worker(self, scenarios: list[str], weights: list[float], deadline: float, record_after: float) -> None:
+        handlers: dict[str, Callable[[], Awaitable[httpx.Response]]] = {name: getattr(self, name) for name in scenarios}
+
+        while perf_counter() < deadline:
+            name = random.choices(scenarios, weights)[0]
+            start = perf_counter()
+
+            try:
+                response = await handlers[name]()
+            except httpx.HTTPError:
+                if start >= record_after:
+                    self.stats.setdefault(name, ScenarioStats()).failures += 1
+                continue
+
+            # requests issued during the warm up period are not recorded
+            if start >= record_after:
+                self.stats.setdefault(name, ScenarioStats()).record(response, (perf_counter() - start) * 1000)
+
+    async def run(self, weights: dict[str, float], concurrency: int, duration: float, warmup: float) -> float:
+        scenarios = [name for name, weight in weights.items() if weight > 0]
+        started_at = perf_counter()
+        record_after = started_at + warmup
+
+        await asyncio.gather(*(
+            self._worker(scenarios, [weights[name] for name in scenarios], record_after + duration, record_after)
+            for _ in range(concurrency)
+        ))
+
+        return perf_counter() - record_after
+
+
+async def fetch_accounts(sample_size: int) -> dict[str, list]:
+    conn = await asyncpg.connect(
+        host=db_configs.db_host,
+        port=db_configs.db_port,
+        user=db_configs.db_user,
+        password=db_configs.db_pw,
+        database=db_configs.db_name
+    )
+
+    # only verified, active and not deleted users are allowed to log in
+    statement = (
+        'SELECT id, username FROM users '
+        'WHERE username LIKE $1 AND type = $2 AND status = $3 AND is_verified AND NOT is_deleted '
+        'ORDER BY random() LIMIT $4'
+    )
+    prefix = USERNAME_PREFIX.replace('_', '\\_') + '%'
+
+    try:
+        admins = await conn.fetch(statement, prefix, UserType.ADMIN.value, UserStatus.ACTIVE.value, sample_size)
+        users = await conn.fetch(statement, prefix, UserType.CUSTOMER.value, UserStatus.ACTIVE.value, sample_size)
+        ids = await conn.fetch('SELECT id FROM users TABLESAMPLE SYSTEM (1) LIMIT $1', sample_size)
+    finally:
+        await conn.close()
+
+    if not admins or not users:
+        raise SystemExit('No generated accounts found, run benchmarks.dataset first.')
+
+    return {
+        'admins': [dict(row) for row in admins],
+        'users': [dict(row) for row in users],
+        'ids': [str(row['id']) for row in ids] or [str(row['id']) for row in users]
+    }
+
+
+def _parse_weights(value: str) -> dict[str, float]:
+    weights = dict(DEFAULT_WEIGHTS)
+
+    for pair in filter(None, value.split(',')):
+        name, _, weight = pair.partition('=')
+
+        if name not in DEFAULT_WEIGHTS:
+            raise argparse.ArgumentTypeError(f'Unknown scenario {name}, expected one of {", ".join(DEFAULT_WEIGHTS)}.')
+
+        weights[name] = float(weight)
+
+    return weights
+
+
+async def main_async(args: argparse.Namespace) -> dict:
+    accounts = await fetch_accounts(args.sample_size)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=args.timeout) as client:
+        load_test = LoadTest(client, args.api_prefix, accounts)
+        await load_test.authenticate(admins=8, users=min(64, len(accounts['users'])))
+        elapsed_s = await load_test.run(args.weights, args.concurrency, args.duration, args.warmup)
+
+    return {
+        'concurrency': args.concurrency,
+        'duration_s': round(elapsed_s, 3),
+        'scenarios': {name: stats.to_dict(elapsed_s) for name, stats in sorted(load_test.stats.items())}
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://127.0.0.1:8000')
+    parser.add_argument('--api-prefix', default='/api/v1')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=30.0, help='seconds of recorded load')
+    parser.add_argument('--warmup', type=float, default=5.0, help='seconds of unrecorded load first')
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--sample-size', type=int, default=1000, help='accounts and ids sampled from the database')
+    parser.add_argument(
+        '--weights',
+        type=_parse_weights,
+        default=dict(DEFAULT_WEIGHTS),
+        help='comma separated scenario=weight pairs, e.g. login=0,auth=50'
+    )
+    parser.add_argument('--output', default=None, help='also write the report to this JSON file')
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    print(f'{"scenario":<12} {"requests":>9} {"rps":>9} {"errors":>7}   {"p50":>8} {"p95":>8} {"p99":>8}   {"db p50":>8} {"db p95":>8} {"db p99":>8}')
+
+    for name, stats in report['scenarios'].items():
+        latency, db = stats['latency_ms'], stats['db_ms']
+        print(
+            f'{name:<12} {stats["requests"]:>9} {stats["rps"]:>9.1f} {stats["errors"]:>7}   '
+            + ' '.join(f'{latency[p] or 0:>8.2f}' for p in ('p50', 'p95', 'p99')) + '   '
+            + ' '.join(f'{db[p] or 0:>8.2f}' for p in ('p50', 'p95', 'p99'))
+        )
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Compares the request id middleware against the previous BaseHTTPMiddleware
+implementation on a trivial route, calling the ASGI app in-process so that
+only framework and middleware overhead is measured.
+
+    uv run python -m benchmarks.middleware --requests 20000
+"""
+import argparse
+import asyncio
+import logging
+
+from time import perf_counter
+from uuid import uuid4
+from fastapi import (
+    FastAPI,
+    Request
+)
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middlewares import AddRequestIdMiddleware
+from app.utils.request import (
+    set_request_id,
+    remove_request_id
+)
+
+
+class LegacyRequestIdMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id: str = uuid4().hex
+        request.state.request_id = request_id
+        ctx_token = await set_request_id(request_id)
+        response = await call_next(request)
+        await remove_request_id(ctx_token)
+        return response
+
+
+def build_app(middleware_class: type | None) -> FastAPI:
+    app = FastAPI()
+
+    @app.get('/ping')
+    async def ping() -> dict:
+        return {'ping': 'pong'}
+
+    if middleware_class is not None:
+        app.add_middleware(middleware_class)
+
+    return app
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> float:
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': '/ping',
+        'raw_path': b'/ping',
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'host', b'bench')],
+        'client': ('127.0.0.1', 50000),
+        'server': ('bench', 80)
+    }
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        pass
+
+    async def worker(count: int):
+        for _ in range(count):
+            await app(dict(scope), receive, send)
+
+    await worker(100)  # warm up routing and validation caches
+
+    start = perf_counter()
+    await asyncio.gather(*(worker(requests // concurrency) for _ in range(concurrency)))
+    return (requests // concurrency * concurrency) / (perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=20_000)
+    parser.add_argument('--concurrency', type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    results = {}
+
+    for name, middleware_class in (
+        ('no middleware', None),
+        ('BaseHTTPMiddleware (legacy)', LegacyRequestIdMiddleware),
+        ('pure ASGI', AddRequestIdMiddleware)
+    ):
+        results[name] = asyncio.run(run(build_app(middleware_class), args.requests, args.concurrency))
+        print(f'{name:<30} {results[name]:>10.0f} req/s')
+
+    gain = results['pure ASGI'] / results['BaseHTTPMiddleware (legacy)'] - 1
+    print(f'{"pure ASGI vs legacy":<30} {gain:>+10.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+Measures how long a fresh interpreter takes to import the app, using the
+numbers reported by `python -X importtime`, and how long a uvicorn worker
+takes from spawn until it answers its first request. Neither needs a
+database, since the liveness probe performs no I/O.
+
+    uv run python -m benchmarks.startup --runs 5
+"""
+import argparse
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+
+from time import (
+    perf_counter,
+    sleep
+)
+from urllib.error import URLError
+from urllib.request import urlopen
+
+_importtime_regex = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def measure_imports(module: str) -> tuple[float, dict[str, int]]:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-W', 'ignore', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    total_us = 0
+    packages: dict[str, int] = {}
+
+    for line in result.stderr.splitlines():
+        match = _importtime_regex.match(line)
+
+        if match is None:
+            continue
+
+        self_us, cumulative_us, _, name = match.groups()
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self_us)
+
+        if name == module:
+            total_us = int(cumulative_us)
+
+    return total_us / 1000, packages
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(app: str, path: str, timeout: float) -> float:
+    port = _free_port()
+    start = perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-W', 'ignore', '-m', 'uvicorn', app, '--port', str(port), '--log-level', 'warning'],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, 'LOG_FORMAT': 'text'}
+    )
+
+    try:
+        while perf_counter() - start < timeout:
+            try:
+                with urlopen(f'http://127.0.0.1:{port}{path}', timeout=1) as response:
+                    if response.status == 200:
+                        return (perf_counter() - start) * 1000
+            except (URLError, ConnectionError):
+                sleep(0.005)
+
+        raise TimeoutError(f'{app} did not answer {path} within {timeout} seconds')
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app.main')
+    parser.add_argument('--app', default='app.main:app')
+    parser.add_argument('--path', default='/api/v1/health/live')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    import_ms: list[float] = []
+    packages: dict[str, list[int]] = {}
+
+    for _ in range(args.runs):
+        total_ms, run_packages = measure_imports(args.module)
+        import_ms.append(total_ms)
+
+        for package, self_us in run_packages.items():
+            packages.setdefault(package, []).append(self_us)
+
+    first_response_ms = [
+        measure_first_response(args.app, args.path, args.timeout)
+        for _ in range(args.runs)
+    ]
+
+    print(f'{"import " + args.module:<30} {statistics.median(import_ms):>10.1f} ms (median of {args.runs})')
+    print(f'{"spawn to first response":<30} {statistics.median(first_response_ms):>10.1f} ms (median of {args.runs})')
+    print()
+    print(f'{"slowest packages (self time)":<30}')
+
+    for package, self_us in sorted(packages.items(), key=lambda item: statistics.median(item[1]), reverse=True)[:args.top]:
+        print(f'  {package:<28} {statistics.median(self_us) / 1000:>10.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
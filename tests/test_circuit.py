@@ -0,0 +1,80 @@
+import asyncio
+import unittest
+
+from app.database.circuit import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    DatabaseUnavailableError
+)
+
+
+class FakeDialect:
+    def __init__(self, error: BaseException | None = None):
+        self.error: BaseException | None = error
+
+    def connect(self, *cargs, **cparams) -> object:
+        if self.error is not None:
+            raise self.error
+
+        return object()
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    def test_failures_open_the_circuit(self):
+        breaker = CircuitBreaker(window=30.0, min_attempts=2, failure_rate=0.5, open_for=60.0, half_open_probes=1)
+
+        for _ in range(2):
+            with self.assertRaises(DatabaseUnavailableError):
+                breaker.on_connect(FakeDialect(ConnectionRefusedError()), None, (), {})
+
+        self.assertEqual(breaker.state, OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            breaker.on_connect(FakeDialect(), None, (), {})
+
+        self.assertEqual(breaker.rejections, 1)
+
+    def test_successful_probes_close_the_circuit(self):
+        breaker = CircuitBreaker(window=30.0, min_attempts=1, failure_rate=0.5, open_for=0.0, half_open_probes=2)
+
+        with self.assertRaises(DatabaseUnavailableError):
+            breaker.on_connect(FakeDialect(ConnectionRefusedError()), None, (), {})
+
+        self.assertEqual(breaker.state, OPEN)
+        breaker.on_connect(FakeDialect(), None, (), {})
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.on_connect(FakeDialect(), None, (), {})
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_cancelled_probes_release_their_slot(self):
+        breaker = CircuitBreaker(window=30.0, min_attempts=1, failure_rate=0.5, open_for=0.0, half_open_probes=2)
+
+        with self.assertRaises(DatabaseUnavailableError):
+            breaker.on_connect(FakeDialect(ConnectionRefusedError()), None, (), {})
+
+        for _ in range(4):
+            with self.assertRaises(asyncio.CancelledError):
+                breaker.on_connect(FakeDialect(asyncio.CancelledError()), None, (), {})
+
+            self.assertEqual(breaker.state, HALF_OPEN)
+
+        for _ in range(2):
+            breaker.on_connect(FakeDialect(), None, (), {})
+
+        self.assertEqual(breaker.state, CLOSED)
+
+    def test_cancelled_connects_are_not_failures(self):
+        breaker = CircuitBreaker(window=30.0, min_attempts=2, failure_rate=0.5, open_for=60.0, half_open_probes=1)
+
+        for _ in range(10):
+            with self.assertRaises(asyncio.CancelledError):
+                breaker.on_connect(FakeDialect(asyncio.CancelledError()), None, (), {})
+
+        self.assertEqual(breaker.state, CLOSED)
+        self.assertEqual(breaker.to_dict()['failures'], 0)
+
+if __name__ == '__main__':
+    unittest.main()